@@ -7,6 +7,23 @@ TWELVE_LABS_API_KEY = os.getenv("TWELVE_LABS_API_KEY")
 
 VIDEO_DATA_DIR = "data/videos"
 EMBEDDINGS_FILE = "embeddings.json"
+EMBEDDINGS_REFRESH_INTERVAL = 30  # seconds between API reloads of the embeddings file
 VECTOR_DB_PATH = "vector_db.index"
 
-MAX_SEARCH_RESULTS = 5
\ No newline at end of file
+MAX_CONCURRENT_UPLOADS = 5
+
+MAX_SEARCH_RESULTS = 5
+
+# Search result cache
+SEARCH_CACHE_FILE = ".search_cache.json"
+SEARCH_CACHE_SIZE = 1024
+SEARCH_CACHE_TTL = 3600  # seconds
+CLI_SEARCH_CACHE_FILE = ".test_search_cache.json"  # Used by test_search.py
+
+# FAISS index settings ("flat", "hnsw" or "ivfpq")
+VECTOR_INDEX_TYPE = "hnsw"
+HNSW_M = 32
+HNSW_EF_CONSTRUCTION = 200
+HNSW_EF_SEARCH = 64
+IVF_NPROBE = 16
+VECTOR_QUANTIZATION = "fp16"  # None, "fp16" or "int8"
@@ -3,33 +3,174 @@
 Cost tracking for Twelve Labs API usage
 """
 
-import json
+import asyncio
+import atexit
+import io
+import mmap
+import os
+import orjson
 import time
 from datetime import datetime
 from pathlib import Path
 
 
+# Which running total each session type adds to
+COST_KEYS = {
+    "video_processing": "video_processing_cost",
+    "search_queries": "search_cost",
+}
+
+
 class CostTracker:
-    def __init__(self, log_file="cost_log.json"):
-        self.log_file = log_file
+    # Number of logged events buffered in memory before the log is rewritten
+    _FLUSH_EVERY = 32
+    # Maximum number of queued events applied per background write
+    _WRITER_BATCH = 64
+
+    def __init__(self, log_file="cost_log.jsonl", totals_file="cost_totals.json"):
+        self.log_file = log_file  # Append-only, one JSON session per line
+        self.totals_file = totals_file  # Small sidecar with the running totals
         self.costs = self.load_costs()
+        self._pending = []  # Sessions not yet appended to the log
+        self._dirty_count = 0
+        self._queue = None
+        self._queued_cost = 0.0  # Cost of sessions queued but not yet applied by the writer
+        self._writer_task = None
+        self._write_lock = None
+        atexit.register(self.flush)
 
-    def load_costs(self):
-        """Load existing cost data"""
-        if Path(self.log_file).exists():
-            with open(self.log_file, 'r') as f:
-                return json.load(f)
+    @staticmethod
+    def empty_costs():
+        """Running totals for an empty log"""
         return {
             "total_cost": 0.0,
             "video_processing_cost": 0.0,
             "search_cost": 0.0,
-            "sessions": []
+            "session_count": 0
         }
 
+    @staticmethod
+    def add_session(costs, session):
+        """Add a session's cost to a totals dict"""
+        costs[COST_KEYS[session["type"]]] += session["session_cost"]
+        costs["total_cost"] += session["session_cost"]
+        costs["session_count"] += 1
+
+    def load_costs(self):
+        """Load running totals from the sidecar, rebuilding them from the log if needed"""
+        if Path(self.totals_file).exists():
+            with open(self.totals_file, 'rb') as f:
+                return orjson.loads(f.read())
+        if Path(self.log_file).exists():
+            return self.scan_log()
+        return self.empty_costs()
+
+    def scan_log(self):
+        """Recompute running totals with a single pass over the JSONL log"""
+        costs = self.empty_costs()
+        with open(self.log_file, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return costs
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                for line in iter(mm.readline, b""):
+                    if line.strip():
+                        self.add_session(costs, orjson.loads(line))
+        return costs
+
     def save_costs(self):
-        """Save cost data to file"""
-        with open(self.log_file, 'w') as f:
-            json.dump(self.costs, f, indent=2)
+        """Append buffered sessions to the log and atomically rewrite the totals sidecar"""
+        pending, self._pending = self._pending, []
+        if pending:
+            with open(self.log_file, 'ab', buffering=64 * 1024) as f:
+                for session in pending:
+                    f.write(orjson.dumps(session) + b"\n")
+
+        tmp_file = f"{self.totals_file}.tmp"
+        with io.BufferedWriter(io.FileIO(tmp_file, 'w')) as f:
+            f.write(orjson.dumps(self.costs, option=orjson.OPT_INDENT_2))
+        os.replace(tmp_file, self.totals_file)
+        self._dirty_count = 0
+
+    def flush(self):
+        """Write any buffered sessions to disk"""
+        if self._dirty_count:
+            self.save_costs()
+
+    def _mark_dirty(self):
+        """Record a new event and save once enough events are buffered"""
+        self._dirty_count += 1
+        if self._dirty_count >= self._FLUSH_EVERY:
+            self.save_costs()
+
+    def _apply(self, session):
+        """Add a session to the running totals and the pending log lines"""
+        self.add_session(self.costs, session)
+        self._pending.append(session)
+
+    def _record(self, session):
+        """Queue a session for the background writer, or apply it directly"""
+        if self._queue is not None:
+            self._queued_cost += session["session_cost"]
+            self._queue.put_nowait(session)
+        else:
+            self._apply(session)
+            self._mark_dirty()
+
+    def start_writer(self):
+        """Start a background task that applies and saves logged sessions
+
+        Must be called from a running event loop. While the writer runs,
+        log_* calls only enqueue the session and return immediately.
+        """
+        self._queue = asyncio.Queue()
+        self._write_lock = asyncio.Lock()
+        self._writer_task = asyncio.create_task(self._run_writer())
+
+    async def stop_writer(self):
+        """Stop the background writer and save everything still queued"""
+        if self._writer_task is None:
+            return
+        # A None sentinel tells the writer to finish after the sessions queued before it
+        self._queue.put_nowait(None)
+        await self._writer_task
+        async with self._write_lock:
+            self.flush()
+        self._queue = None
+        self._writer_task = None
+
+    def _apply_queued(self, session):
+        """Apply a session taken off the writer queue"""
+        self._apply(session)
+        self._queued_cost -= session["session_cost"]
+        self._dirty_count += 1
+
+    def _drain(self, limit):
+        """Apply up to limit queued sessions without waiting
+
+        Returns False if the stop sentinel was reached.
+        """
+        for _ in range(limit):
+            try:
+                session = self._queue.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            if session is None:
+                return False
+            self._apply_queued(session)
+        return True
+
+    async def _run_writer(self):
+        """Apply queued sessions in batches and save once per batch"""
+        running = True
+        while running:
+            # Sleeps until a session arrives; stop_writer's None sentinel ends the loop
+            session = await self._queue.get()
+            async with self._write_lock:
+                if session is None:
+                    break
+                self._apply_queued(session)
+                running = self._drain(self._WRITER_BATCH - 1)
+                await asyncio.to_thread(self.save_costs)
 
     def log_video_processing(self, video_count, total_duration_minutes):
         """Log video processing costs"""
@@ -45,13 +186,11 @@ class CostTracker:
             "session_cost": session_cost
         }
 
-        self.costs["video_processing_cost"] += session_cost
-        self.costs["total_cost"] += session_cost
-        self.costs["sessions"].append(session)
-        self.save_costs()
+        self._record(session)
 
         print(f"💰 Video processing cost: ${session_cost:.4f}")
-        print(f"📊 Total cost so far: ${self.costs['total_cost']:.4f}")
+        # Include sessions the background writer has not applied yet, this one among them
+        print(f"📊 Total cost so far: ${self.costs['total_cost'] + self._queued_cost:.4f}")
 
     def log_search_query(self, query_count=1):
         """Log search query costs (negligible but tracked)"""
@@ -66,10 +205,7 @@ class CostTracker:
             "session_cost": session_cost
         }
 
-        self.costs["search_cost"] += session_cost
-        self.costs["total_cost"] += session_cost
-        self.costs["sessions"].append(session)
-        self.save_costs()
+        self._record(session)
 
     def get_summary(self):
         """Get cost summary"""
@@ -78,7 +214,7 @@ class CostTracker:
             "video_processing": self.costs["video_processing_cost"],
             "search_queries": self.costs["search_cost"],
             "budget_remaining": 100.0 - self.costs["total_cost"],
-            "session_count": len(self.costs["sessions"])
+            "session_count": self.costs["session_count"]
         }
 
     def print_summary(self):
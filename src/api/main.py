@@ -1,18 +1,26 @@
-from fastapi import FastAPI, HTTPException, UploadFile, File, Form
+from fastapi import FastAPI, HTTPException, UploadFile, File, Form, Header
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import FileResponse, ORJSONResponse, StreamingResponse
 from pydantic import BaseModel
 from typing import List, Dict, Any, Optional
+import asyncio
+import gzip
+import queue
 import shutil
 import tempfile
-import json
+import orjson
+import os
 import sys
 import logging
+from itertools import islice
 from pathlib import Path
 from contextlib import asynccontextmanager
 
 # Configure logging
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+
 logging.basicConfig(
-    level=logging.DEBUG,
+    level=LOG_LEVEL,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
     handlers=[
         logging.StreamHandler()  # Output to console
@@ -23,10 +31,30 @@ logger = logging.getLogger("semantic_video_search")
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
 from src.embeddings.twelve_labs_client import TwelveLabsClient
-from config.settings import EMBEDDINGS_FILE, MAX_SEARCH_RESULTS
+from src.api.search_cache import SearchCache
+from cost_tracker import CostTracker
+from config.settings import EMBEDDINGS_FILE, MAX_SEARCH_RESULTS, EMBEDDINGS_REFRESH_INTERVAL
 
 client = TwelveLabsClient()
+search_cache = SearchCache()
+cost_tracker = CostTracker()
 index_id = None
+VIDEO_INDEX: Dict[str, Dict[str, Any]] = {}  # video_id -> video metadata
+_EMBED_CACHE: Dict[str, Any] = {"path": None, "mtime": None, "data": None}
+
+# Search options shared by every request; only search_options and page_limit vary
+BASE_SEARCH_OPTIONS = {
+    "threshold": "medium",
+    "operator": "or",
+    "adjust_confidence_level": 0.5
+}
+
+# Chunk size for streaming video byte ranges to the browser
+MEDIA_CHUNK_SIZE = 1024 * 1024
+
+# Pool of result lists reused across requests to reduce allocator/GC churn
+_RESULT_LIST_POOL: "queue.LifoQueue[list]" = queue.LifoQueue(maxsize=64)
+_POOLED_LIST_MAX_LEN = 64
 
 
 class SearchQuery(BaseModel):
@@ -35,6 +63,16 @@ class SearchQuery(BaseModel):
     search_options: List[str] = ["visual", "audio"]
 
 
+class BatchQuery(BaseModel):
+    q: str
+    top_k: int = MAX_SEARCH_RESULTS
+
+
+class BatchSearchRequest(BaseModel):
+    queries: List[BatchQuery]
+    search_options: List[str] = ["visual", "audio"]
+
+
 class SearchResult(BaseModel):
     video_id: str
     filename: str
@@ -54,33 +92,111 @@ class SearchResponse(BaseModel):
     search_type: str = "text"  # Can be "text" or "image"
 
 
+def get_embeddings() -> Dict[str, Any]:
+    """Return the parsed embeddings file, re-reading it only when its mtime changes
+
+    Falls back to a gzip-compressed copy (embeddings.json.gz) when the plain
+    file does not exist. Raises FileNotFoundError if neither is present.
+    """
+    path = Path(EMBEDDINGS_FILE)
+    if not path.exists():
+        path = Path(f"{EMBEDDINGS_FILE}.gz")
+    mtime = path.stat().st_mtime
+
+    if path != _EMBED_CACHE["path"] or mtime != _EMBED_CACHE["mtime"]:
+        opener = gzip.open if path.suffix == ".gz" else open
+        with opener(path, 'rb') as f:
+            _EMBED_CACHE["data"] = orjson.loads(f.read())
+        _EMBED_CACHE["path"] = path
+        _EMBED_CACHE["mtime"] = mtime
+
+    return _EMBED_CACHE["data"]
+
+
 def load_index_id():
-    """Load index ID from embeddings file"""
-    global index_id
+    """Load index ID and video metadata from embeddings file"""
+    global index_id, VIDEO_INDEX
     try:
-        with open(EMBEDDINGS_FILE, 'r') as f:
-            data = json.load(f)
-            index_id = data.get("index_id")
-            return index_id is not None
+        data = get_embeddings()
     except FileNotFoundError:
         return False
+    index_id = data.get("index_id")
+    VIDEO_INDEX = {v["video_id"]: v for v in data.get("videos", []) if v.get("video_id")}
+    return index_id is not None
+
+
+def refresh_video_index():
+    """Reload the video index if the embeddings file changed since it was last loaded"""
+    previous = _EMBED_CACHE["data"]
+    try:
+        data = get_embeddings()
+    except FileNotFoundError:
+        return
+    if data is not previous:
+        logger.info("Embeddings file changed, reloading video index")
+        load_index_id()
+
+
+async def refresh_loop():
+    """Periodically reload the video index off the event loop"""
+    while True:
+        await asyncio.sleep(EMBEDDINGS_REFRESH_INTERVAL)
+        try:
+            await asyncio.to_thread(refresh_video_index)
+        except Exception as e:
+            logger.error("Failed to refresh video index: %s", e)
+
+
+def acquire_result_list() -> list:
+    """Take an empty result list from the pool, or create one"""
+    try:
+        return _RESULT_LIST_POOL.get_nowait()
+    except queue.Empty:
+        return []
+
+
+def release_result_list(results: list):
+    """Clear a result list and return it to the pool if it is small enough"""
+    if len(results) > _POOLED_LIST_MAX_LEN:
+        return
+    results.clear()
+    try:
+        _RESULT_LIST_POOL.put_nowait(results)
+    except queue.Full:
+        pass
+
+
+def lookup_video(video_id: str, filename: str):
+    """Return (filename, filepath) for a video_id from the in-memory index"""
+    meta = VIDEO_INDEX.get(video_id)
+    if meta:
+        return meta.get("filename", filename), meta.get("filepath", "unknown")
+    return filename, "unknown"
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan event handler for startup and shutdown events"""
-    # Startup: Load index ID
-    if not load_index_id():
+    # Startup: Load index ID and start the background refresher
+    if not await asyncio.to_thread(load_index_id):
         print("Warning: No embeddings file found. Run embedding generation first.")
+    search_cache.load()
+    cost_tracker.start_writer()
+    refresh_task = asyncio.create_task(refresh_loop())
     yield
-    # Shutdown: Any cleanup code would go here
+    # Shutdown: Stop background tasks, persist caches/costs and release pooled connections
+    refresh_task.cancel()
+    await cost_tracker.stop_writer()
+    search_cache.save()
+    client.close()
 
 
 # Create FastAPI app with lifespan handler
 app = FastAPI(
     title="Semantic Video Search API", 
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 app.add_middleware(
@@ -92,6 +208,88 @@ app.add_middleware(
 )
 
 
+def fetch_text_items(query_text: str, max_results: int, search_options: List[str]):
+    """Return (result items, whether the API was called) for a text query, using the search cache"""
+    options = {
+        **BASE_SEARCH_OPTIONS,
+        "search_options": search_options,
+        "page_limit": max_results
+    }
+    logger.debug("Search options: %s", options)
+
+    # Check the cache before calling the API
+    cache_key = SearchCache.make_key(index_id, query_text, options)
+    cached_items = search_cache.get(cache_key)
+    if cached_items is not None:
+        logger.info("Search cache hit")
+        return cached_items, False
+
+    # Search using Twelve Labs API
+    result = client.search_text(
+        index_id=index_id,
+        query=query_text,
+        options=options
+    )
+
+    logger.info("Search result success: %s", result['success'])
+
+    if not result["success"]:
+        error_msg = f"Search failed: {result['error']}"
+        logger.error(error_msg)
+        raise HTTPException(
+            status_code=500,
+            detail=error_msg
+        )
+
+    data_items = result["data"].get("data", [])
+    search_cache.set(cache_key, data_items)
+    return data_items, True
+
+
+def build_text_results(data_items: List[Dict[str, Any]], max_results: int, search_results: list) -> list:
+    """Append SearchResult-shaped dicts for the first max_results text search items"""
+    logger.info("Number of results: %s", len(data_items))
+
+    debug_enabled = logger.isEnabledFor(logging.DEBUG)
+    try:
+        for i, item in enumerate(islice(data_items, max_results)):
+            if debug_enabled:
+                logger.debug("Result %d keys: %s", i + 1, list(item.keys()) if isinstance(item, dict) else "not-dict")
+
+            # Extract video filename from metadata
+            metadata = item.get("metadata", {})
+            filename = metadata.get("filename", "unknown") if isinstance(metadata, dict) else "unknown"
+
+            # Make sure clip_text is always a string
+            clip_text = item.get("clip_text", "")
+            if clip_text is None:
+                clip_text = ""
+
+            # Handle thumbnail_url properly - keep it None if it's None
+            thumbnail_url = item.get("thumbnail_url")
+
+            # Look up the filepath for the video in the in-memory index
+            video_id = item.get("video_id", "")
+            filename, video_filepath = lookup_video(video_id, filename)
+
+            # Plain dict with the SearchResult fields, skips per-item model validation
+            search_results.append({
+                "video_id": video_id,
+                "filename": filename,
+                "confidence": item.get("confidence", "unknown"),  # Default to "unknown" for confidence
+                "score": item.get("score", 0.0),
+                "start": item.get("start", 0.0),
+                "end": item.get("end", 0.0),
+                "clip_text": clip_text,
+                "thumbnail_url": thumbnail_url,  # This can be None
+                "video_filepath": video_filepath  # Add the actual video file path
+            })
+    except Exception as e:
+        logger.exception("Error processing search results: %s", e)
+        # Continue with whatever results we managed to process
+    return search_results
+
+
 @app.get("/")
 async def root():
     return {"message": "Semantic Video Search API", "status": "running"}
@@ -109,7 +307,7 @@ async def health_check():
 @app.post("/search", response_model=SearchResponse)
 async def search_videos_text(query: SearchQuery):
     """Search videos with text query"""
-    logger.info(f"Received text search request with query: '{query.query}', max_results: {query.max_results}")
+    logger.info("Received text search request with query: '%s', max_results: %s", query.query, query.max_results)
     
     if not query.query or not query.query.strip():
         raise HTTPException(
@@ -125,115 +323,91 @@ async def search_videos_text(query: SearchQuery):
         )
 
     try:
-        logger.info(f"Searching index {index_id} with query: '{query.query}'")
-        
-        # Prepare search options
-        search_options = {
-            "search_options": query.search_options,
-            "threshold": "medium",
-            "operator": "or",
-            "page_limit": query.max_results,
-            "adjust_confidence_level": 0.5
-        }
-        
-        logger.debug(f"Search options: {search_options}")
-        
-        # Search using Twelve Labs API
-        result = client.search_text(
-            index_id=index_id,
-            query=query.query,
-            options=search_options
-        )
-
-        logger.info(f"Search result success: {result['success']}")
-        
-        if not result["success"]:
-            error_msg = f"Search failed: {result['error']}"
-            logger.error(error_msg)
-            raise HTTPException(
-                status_code=500,
-                detail=error_msg
-            )
+        logger.info("Searching index %s with query: '%s'", index_id, query.query)
 
-        search_data = result["data"]
-        logger.debug(f"Search data keys: {search_data.keys() if isinstance(search_data, dict) else 'Not a dict'}")
-        
-        search_results = []
+        data_items, called_api = await asyncio.to_thread(
+            fetch_text_items, query.query, query.max_results, query.search_options
+        )
+        if called_api:
+            cost_tracker.log_search_query()
 
-        # Process search results
-        data_items = search_data.get("data", [])
-        logger.info(f"Number of results: {len(data_items)}")
-        
-        try:
-            for i, item in enumerate(data_items[:query.max_results]):
-                logger.debug(f"Processing result {i+1}")
-                logger.debug(f"Item keys: {item.keys() if isinstance(item, dict) else 'Not a dict'}")
-                
-                # Extract video filename from metadata
-                metadata = item.get("metadata", {})
-                filename = metadata.get("filename", "unknown") if isinstance(metadata, dict) else "unknown"
-                logger.debug(f"Filename: {filename}")
-                
-                # Make sure clip_text is always a string
-                clip_text = item.get("clip_text", "")
-                if clip_text is None:
-                    clip_text = ""
-                
-                # Handle thumbnail_url properly - keep it None if it's None
-                thumbnail_url = item.get("thumbnail_url")
-                
-                # Find the filepath for the video from the embeddings file
-                video_filepath = "unknown"
-                try:
-                    with open(EMBEDDINGS_FILE, 'r') as f:
-                        embeddings_data = json.load(f)
-                        video_id = item.get("video_id", "")
-                        for video in embeddings_data.get("videos", []):
-                            if video.get("video_id") == video_id:
-                                filename = video.get("filename", filename)
-                                video_filepath = video.get("filepath", "unknown")
-                                break
-                except Exception as e:
-                    logger.error(f"Error finding video filepath: {str(e)}")
-                
-                search_result = SearchResult(
-                    video_id=item.get("video_id", ""),
-                    filename=filename,
-                    confidence=item.get("confidence", "unknown"),  # Default to "unknown" for confidence
-                    score=item.get("score", 0.0),
-                    start=item.get("start", 0.0),
-                    end=item.get("end", 0.0),
-                    clip_text=clip_text,
-                    thumbnail_url=thumbnail_url,  # This can now be None
-                    video_filepath=video_filepath  # Add the actual video file path
-                )
-                search_results.append(search_result)
-        except Exception as e:
-            import traceback
-            logger.error(f"Error processing search results: {str(e)}")
-            logger.error(f"Traceback: {traceback.format_exc()}")
-            # Continue with whatever results we managed to process
+        search_results = acquire_result_list()
+        build_text_results(data_items, query.max_results, search_results)
 
-        logger.info(f"Returning {len(search_results)} search results")
+        logger.info("Returning %s search results", len(search_results))
         
-        return SearchResponse(
-            query=query.query,
-            results=search_results,
-            total_results=len(search_results),
-            search_type="text"
-        )
+        # Returning the response directly bypasses response_model re-validation;
+        # SearchResponse is still used for the OpenAPI schema
+        # ORJSONResponse serializes immediately, so the list can go back to the pool
+        response = ORJSONResponse({
+            "query": query.query,
+            "results": search_results,
+            "total_results": len(search_results),
+            "search_type": "text"
+        })
+        release_result_list(search_results)
+        return response
     except Exception as e:
-        import traceback
         error_msg = f"Unexpected search error: {str(e)}"
-        logger.error(error_msg)
-        logger.error(f"Exception type: {type(e)}")
-        logger.error(f"Traceback: {traceback.format_exc()}")
+        logger.exception("%s (%s)", error_msg, type(e).__name__)
         raise HTTPException(
             status_code=500,
             detail=error_msg
         )
         
         
+@app.post("/batch-search")
+async def batch_search(request: BatchSearchRequest):
+    """Search several text queries in one request; queries run concurrently"""
+    logger.info("Received batch search request with %d queries", len(request.queries))
+
+    if not index_id:
+        logger.error("Batch search failed: No index found")
+        raise HTTPException(
+            status_code=400,
+            detail="No index found. Run embedding generation first."
+        )
+
+    async def run_query(batch_query: BatchQuery):
+        if not batch_query.q.strip():
+            raise ValueError("Query text cannot be empty")
+        return await asyncio.to_thread(fetch_text_items, batch_query.q, batch_query.top_k, request.search_options)
+
+    outcomes = await asyncio.gather(
+        *(run_query(batch_query) for batch_query in request.queries),
+        return_exceptions=True
+    )
+
+    # Per-query responses have the /search shape; failed queries carry an error instead
+    responses = []
+    api_calls = 0
+    for batch_query, outcome in zip(request.queries, outcomes):
+        if isinstance(outcome, Exception):
+            responses.append({
+                "query": batch_query.q,
+                "results": [],
+                "total_results": 0,
+                "search_type": "text",
+                "error": str(getattr(outcome, "detail", outcome))
+            })
+            continue
+        data_items, called_api = outcome
+        api_calls += called_api
+        results = build_text_results(data_items, batch_query.top_k, [])
+        responses.append({
+            "query": batch_query.q,
+            "results": results,
+            "total_results": len(results),
+            "search_type": "text"
+        })
+
+    # Cost logging stays on the event loop thread
+    if api_calls:
+        cost_tracker.log_search_query(api_calls)
+
+    return {"results": responses, "total_queries": len(responses)}
+
+
 @app.post("/search/image", response_model=SearchResponse)
 async def search_videos_image(
     image_file: UploadFile = File(...),
@@ -241,7 +415,7 @@ async def search_videos_image(
     search_options: str = Form("visual,audio")
 ):
     """Search videos with an image query"""
-    logger.info(f"Received image search request with file: {image_file.filename}, max_results: {max_results}")
+    logger.info("Received image search request with file: %s, max_results: %s", image_file.filename, max_results)
     
     # Validate image file
     if not image_file.content_type.startswith('image/'):
@@ -263,26 +437,25 @@ async def search_videos_image(
             shutil.copyfileobj(image_file.file, temp_file)
             temp_path = temp_file.name
             
-        logger.info(f"Saved uploaded image to temporary file: {temp_path}")
+        logger.info("Saved uploaded image to temporary file: %s", temp_path)
         
         # Parse search options
         search_options_list = search_options.split(',')
         
         # Prepare search options
         search_options_dict = {
+            **BASE_SEARCH_OPTIONS,
             "search_options": search_options_list,
-            "threshold": "medium",
-            "operator": "or",
-            "page_limit": max_results,
-            "adjust_confidence_level": 0.5
+            "page_limit": max_results
         }
         
-        logger.debug(f"Search options: {search_options_dict}")
+        logger.debug("Search options: %s", search_options_dict)
         
         try:
             # Search using Twelve Labs API with image
             with open(temp_path, "rb") as image:
-                result = client.search_image(
+                result = await asyncio.to_thread(
+                    client.search_image,
                     index_id=index_id,
                     image_file=image,
                     options=search_options_dict
@@ -291,7 +464,7 @@ async def search_videos_image(
             # Clean up the temporary file
             Path(temp_path).unlink(missing_ok=True)
 
-        logger.info(f"Search result success: {result['success']}")
+        logger.info("Search result success: %s", result['success'])
         
         if not result["success"]:
             error_msg = f"Image search failed: {result.get('message', 'Unknown error')}"
@@ -301,23 +474,25 @@ async def search_videos_image(
                 detail=error_msg
             )
         
+        cost_tracker.log_search_query()
+
         # Process results
         search_data = result.get("data", {})
-        search_results = []
+        search_results = acquire_result_list()
         
         # Structure is the same as text search
         data_items = search_data.get("data", [])
-        logger.info(f"Number of results: {len(data_items)}")
+        logger.info("Number of results: %s", len(data_items))
         
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
         try:
-            for i, item in enumerate(data_items[:int(max_results)]):
-                logger.debug(f"Processing result {i+1}")
-                logger.debug(f"Item keys: {item.keys() if isinstance(item, dict) else 'Not a dict'}")
+            for i, item in enumerate(islice(data_items, int(max_results))):
+                if debug_enabled:
+                    logger.debug("Result %d keys: %s", i + 1, list(item.keys()) if isinstance(item, dict) else "not-dict")
                 
                 # Extract video filename from metadata
                 metadata = item.get("metadata", {})
                 filename = metadata.get("filename", "unknown") if isinstance(metadata, dict) else "unknown"
-                logger.debug(f"Filename: {filename}")
                 
                 # Extract clip text if available
                 clip_text = ""
@@ -325,53 +500,38 @@ async def search_videos_image(
                 # Handle thumbnail_url properly - keep it None if it's None
                 thumbnail_url = item.get("thumbnail_url")
                 
-                # Find the filepath for the video from the embeddings file
-                video_filepath = "unknown"
-                try:
-                    with open(EMBEDDINGS_FILE, 'r') as f:
-                        embeddings_data = json.load(f)
-                        video_id = item.get("video_id", "")
-                        for video in embeddings_data.get("videos", []):
-                            if video.get("video_id") == video_id:
-                                filename = video.get("filename", filename)
-                                video_filepath = video.get("filepath", "unknown")
-                                break
-                except Exception as e:
-                    logger.error(f"Error finding video filepath: {str(e)}")
+                # Look up the filepath for the video in the in-memory index
+                video_id = item.get("video_id", "")
+                filename, video_filepath = lookup_video(video_id, filename)
                 
-                search_result = SearchResult(
-                    video_id=item.get("video_id", ""),
-                    filename=filename,
-                    confidence=item.get("confidence", ""),
-                    score=item.get("score", 0.0),
-                    start=item.get("start", 0.0),
-                    end=item.get("end", 0.0),
-                    clip_text=clip_text,
-                    thumbnail_url=thumbnail_url,
-                    video_filepath=video_filepath
-                )
-                
-                search_results.append(search_result)
+                search_results.append({
+                    "video_id": video_id,
+                    "filename": filename,
+                    "confidence": item.get("confidence", ""),
+                    "score": item.get("score", 0.0),
+                    "start": item.get("start", 0.0),
+                    "end": item.get("end", 0.0),
+                    "clip_text": clip_text,
+                    "thumbnail_url": thumbnail_url,
+                    "video_filepath": video_filepath
+                })
         except Exception as e:
-            import traceback
-            logger.error(f"Error processing search results: {str(e)}")
-            logger.error(f"Traceback: {traceback.format_exc()}")
+            logger.exception("Error processing search results: %s", e)
             # Continue with whatever results we managed to process
 
-        logger.info(f"Returning {len(search_results)} image search results")
+        logger.info("Returning %s image search results", len(search_results))
         
-        return SearchResponse(
-            query=None,  # No text query for image search
-            results=search_results,
-            total_results=len(search_results),
-            search_type="image"
-        )
+        response = ORJSONResponse({
+            "query": None,  # No text query for image search
+            "results": search_results,
+            "total_results": len(search_results),
+            "search_type": "image"
+        })
+        release_result_list(search_results)
+        return response
     except Exception as e:
-        import traceback
         error_msg = f"Unexpected image search error: {str(e)}"
-        logger.error(error_msg)
-        logger.error(f"Exception type: {type(e)}")
-        logger.error(f"Traceback: {traceback.format_exc()}")
+        logger.exception("%s (%s)", error_msg, type(e).__name__)
         raise HTTPException(
             status_code=500,
             detail=error_msg
@@ -381,22 +541,102 @@ async def search_videos_image(
 @app.get("/videos")
 async def list_videos():
     """List all indexed videos"""
-    try:
-        with open(EMBEDDINGS_FILE, 'r') as f:
-            data = json.load(f)
-            videos = data.get("videos", [])
-            return {"videos": videos, "total": len(videos)}
-    except FileNotFoundError:
+    # Served from the copy kept fresh by the background refresher
+    data = _EMBED_CACHE["data"]
+    if data is not None:
+        videos = data.get("videos", [])
+        return {"videos": videos, "total": len(videos)}
+    else:
         raise HTTPException(
             status_code=404,
             detail="No embeddings file found"
         )
 
 
+@app.get("/videos/{video_id}/download")
+async def download_video(video_id: str):
+    """Stream an indexed video file from disk as an attachment"""
+    filename, filepath = lookup_video(video_id, "video.mp4")
+    if filepath == "unknown" or not os.path.isfile(filepath):
+        raise HTTPException(
+            status_code=404,
+            detail=f"Video file not found for {video_id}"
+        )
+    # FileResponse sends the file in chunks instead of loading it into memory
+    return FileResponse(filepath, media_type="video/mp4", filename=filename)
+
+
+def parse_byte_range(range_header: str, file_size: int):
+    """Parse the first range of a "bytes=" Range header into inclusive (start, end)"""
+    unit, _, spec = range_header.partition("=")
+    first, _, last = spec.split(",")[0].strip().partition("-")
+    try:
+        if unit.strip() != "bytes":
+            raise ValueError(unit)
+        if first:
+            start = int(first)
+            end = min(int(last), file_size - 1) if last else file_size - 1
+        else:
+            # Suffix range: the last N bytes
+            start = max(file_size - int(last), 0)
+            end = file_size - 1
+    except ValueError:
+        start, end = file_size, 0  # Reported as unsatisfiable below
+    if start > end or start >= file_size:
+        raise HTTPException(
+            status_code=416,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{file_size}"}
+        )
+    return start, end
+
+
+def iter_file_range(filepath: str, start: int, length: int):
+    """Yield length bytes of a file from offset start, MEDIA_CHUNK_SIZE at a time"""
+    with open(filepath, "rb") as f:
+        f.seek(start)
+        remaining = length
+        while remaining > 0:
+            chunk = f.read(min(MEDIA_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+@app.get("/media/{video_id}")
+async def stream_media(video_id: str, range_header: Optional[str] = Header(None, alias="range")):
+    """Serve an indexed video for in-browser playback, honouring HTTP Range requests"""
+    _, filepath = lookup_video(video_id, "video.mp4")
+    if filepath == "unknown" or not os.path.isfile(filepath):
+        raise HTTPException(
+            status_code=404,
+            detail=f"Video file not found for {video_id}"
+        )
+
+    file_size = os.path.getsize(filepath)
+    headers = {"Accept-Ranges": "bytes"}
+    if range_header is None:
+        headers["Content-Length"] = str(file_size)
+        return StreamingResponse(iter_file_range(filepath, 0, file_size), media_type="video/mp4", headers=headers)
+
+    # Players seek by requesting just the bytes they need
+    start, end = parse_byte_range(range_header, file_size)
+    length = end - start + 1
+    headers["Content-Range"] = f"bytes {start}-{end}/{file_size}"
+    headers["Content-Length"] = str(length)
+    return StreamingResponse(
+        iter_file_range(filepath, start, length),
+        status_code=206,
+        media_type="video/mp4",
+        headers=headers
+    )
+
+
 if __name__ == "__main__":
     import uvicorn
     logger.info("Starting Semantic Video Search API...")
     logger.info("API docs available at: http://localhost:8000/docs")
     
-    # Run with log level set to show all logs
-    uvicorn.run(app, host="0.0.0.0", port=8000, log_level="debug")
\ No newline at end of file
+    # Run with the configured log level (LOG_LEVEL env var)
+    uvicorn.run(app, host="0.0.0.0", port=8000, log_level=LOG_LEVEL.lower())
\ No newline at end of file
@@ -0,0 +1,78 @@
+import hashlib
+import os
+import threading
+import time
+import orjson
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+from config.settings import SEARCH_CACHE_FILE, SEARCH_CACHE_SIZE, SEARCH_CACHE_TTL
+
+
+class SearchCache:
+    """LRU + TTL cache of Twelve Labs search results, persisted to disk"""
+
+    def __init__(self, path: str = SEARCH_CACHE_FILE, maxsize: int = SEARCH_CACHE_SIZE,
+                 ttl: float = SEARCH_CACHE_TTL):
+        self.path = path
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        # Batch searches look up and fill the cache from worker threads
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(index_id: str, query: str, options: Dict[str, Any]) -> str:
+        """Build a cache key from the index, normalized query text and search options"""
+        normalized = " ".join(query.lower().split())
+        payload = orjson.dumps(
+            {"index_id": index_id, "query": normalized, "options": options},
+            option=orjson.OPT_SORT_KEYS
+        )
+        return hashlib.sha256(payload).hexdigest()
+
+    def get(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        """Return cached results for key, or None if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.time() - entry["ts"] > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry["results"]
+
+    def set(self, key: str, results: List[Dict[str, Any]]):
+        """Store results for key, evicting the least recently used entry when full"""
+        with self._lock:
+            self._entries[key] = {"ts": time.time(), "results": results}
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def load(self):
+        """Load unexpired cache entries from disk"""
+        if not Path(self.path).exists():
+            return
+        try:
+            with open(self.path, 'rb') as f:
+                entries = orjson.loads(f.read())
+        except (OSError, orjson.JSONDecodeError):
+            return
+        now = time.time()
+        for key, entry in entries.items():
+            if now - entry.get("ts", 0) <= self.ttl:
+                self._entries[key] = entry
+
+    def save(self):
+        """Atomically persist cache entries to disk"""
+        with self._lock:
+            payload = orjson.dumps(self._entries)
+        # Write a private temp file next to the cache and swap it in, so a crash or a
+        # concurrent writer never leaves a truncated cache behind
+        tmp_file = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_file, 'wb') as f:
+            f.write(payload)
+        os.replace(tmp_file, self.path)
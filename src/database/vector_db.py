@@ -1,79 +1,197 @@
+import math
 import numpy as np
 import faiss
-import json
-import pickle
-from typing import List, Dict, Tuple, Any
+import orjson
+from typing import List, Dict, Tuple, Any, Union
 from pathlib import Path
-from config.settings import VECTOR_DB_PATH, EMBEDDINGS_FILE
+from config.settings import (
+    VECTOR_DB_PATH, EMBEDDINGS_FILE, VECTOR_INDEX_TYPE, VECTOR_QUANTIZATION,
+    HNSW_M, HNSW_EF_CONSTRUCTION, HNSW_EF_SEARCH, IVF_NPROBE
+)
+
+# Scalar quantizer types for stored vectors (None keeps full float32)
+SQ_TYPES = {
+    "fp16": faiss.ScalarQuantizer.QT_fp16,
+    "int8": faiss.ScalarQuantizer.QT_8bit,
+}
+
+# Below this many vectors IVFPQ cannot be trained reliably, fall back to HNSW
+IVFPQ_MIN_VECTORS = 10000
 
 
 class VectorDatabase:
-    def __init__(self):
+    def __init__(self, index_type: str = VECTOR_INDEX_TYPE, quantization: str = VECTOR_QUANTIZATION):
         self.index = None
-        self.metadata = []
+        self.metadata_cols: Dict[str, np.ndarray] = {}  # column name -> string array
+        self.metadata_count = 0
         self.dimension = 1024  # Twelve Labs embedding dimension
-
-    def create_index(self, embeddings: List[List[float]], metadata: List[Dict[str, Any]]):
+        self.index_type = index_type
+        self.quantization = quantization
+        # Reused query buffer so single searches don't allocate (not thread-safe)
+        self._query_buf = np.empty((1, self.dimension), dtype=np.float32)
+
+    def _build_index(self, embeddings_array: np.ndarray):
+        """Build an empty FAISS index of the configured type"""
+        n = embeddings_array.shape[0]
+        index_type = self.index_type
+
+        if index_type == "ivfpq" and n < IVFPQ_MIN_VECTORS:
+            print(f"⚠️  Only {n} vectors, using HNSW instead of IVFPQ")
+            index_type = "hnsw"
+
+        if self.quantization is not None and self.quantization not in SQ_TYPES:
+            raise ValueError(f"Unknown quantization: {self.quantization}")
+        sq_type = SQ_TYPES.get(self.quantization)
+
+        if index_type == "flat":
+            if sq_type is None:
+                return faiss.IndexFlatIP(self.dimension)  # Exact inner product search
+            # Exact search over fp16/int8 codes, halves or quarters memory
+            index = faiss.IndexScalarQuantizer(self.dimension, sq_type, faiss.METRIC_INNER_PRODUCT)
+            index.train(embeddings_array)
+            return index
+
+        if index_type == "hnsw":
+            # Graph-based ANN search, sub-linear query cost
+            if sq_type is None:
+                index = faiss.IndexHNSWFlat(self.dimension, HNSW_M, faiss.METRIC_INNER_PRODUCT)
+            else:
+                index = faiss.IndexHNSWSQ(self.dimension, sq_type, HNSW_M, faiss.METRIC_INNER_PRODUCT)
+                index.train(embeddings_array)
+            index.hnsw.efConstruction = HNSW_EF_CONSTRUCTION
+            index.hnsw.efSearch = HNSW_EF_SEARCH
+            return index
+
+        if index_type == "ivfpq":
+            # Inverted lists + product quantization, compresses stored vectors
+            nlist = min(4096, 4 * int(math.sqrt(n)))
+            quantizer = faiss.IndexFlatIP(self.dimension)
+            index = faiss.IndexIVFPQ(quantizer, self.dimension, nlist, 64, 8, faiss.METRIC_INNER_PRODUCT)
+            index.train(embeddings_array)
+            index.nprobe = IVF_NPROBE
+            return index
+
+        raise ValueError(f"Unknown index type: {index_type}")
+
+    def create_index(self, embeddings: Union[np.ndarray, List[List[float]]], metadata: List[Dict[str, Any]]):
         """Create FAISS index from embeddings"""
-        embeddings_array = np.array(embeddings, dtype=np.float32)
-        self.dimension = embeddings_array.shape[1]
+        self.index = None
+        self.set_metadata(metadata)
+        self.add(embeddings)
 
-        self.index = faiss.IndexFlatIP(self.dimension)  # Inner product for similarity
+        print(f"✅ Created FAISS {self.index_type} index with {self.index.ntotal} vectors")
+
+    def create_empty_index(self, metadata: List[Dict[str, Any]]):
+        """Store metadata only; the FAISS index is created on the first add()"""
+        self.index = None
+        self.set_metadata(metadata)
+
+    def add(self, embeddings: Union[np.ndarray, List[List[float]]]):
+        """Add embeddings to the index, creating it on first use"""
+        embeddings_array = np.ascontiguousarray(embeddings, dtype=np.float32)
 
         # Normalize embeddings for cosine similarity
         faiss.normalize_L2(embeddings_array)
 
+        if self.index is None:
+            self.dimension = embeddings_array.shape[1]
+            self.index = self._build_index(embeddings_array)
         self.index.add(embeddings_array)
-        self.metadata = metadata
 
-        print(f"✅ Created FAISS index with {self.index.ntotal} vectors")
+    def set_metadata(self, metadata: List[Dict[str, Any]]):
+        """Store fixed-schema metadata dicts as columnar string arrays"""
+        columns = list(dict.fromkeys(key for item in metadata for key in item))
+        self.metadata_cols = {
+            col: np.array([str(item.get(col, "")) for item in metadata], dtype=str)
+            for col in columns
+        }
+        self.metadata_count = len(metadata)
+
+    def get_metadata(self, idx: int) -> Dict[str, Any]:
+        """Build the metadata dict for a single vector from the columns"""
+        return {col: str(values[idx]) for col, values in self.metadata_cols.items()}
+
+    def set_ef_search(self, ef_search: int):
+        """Tune the HNSW search breadth (higher is more accurate but slower)"""
+        hnsw = getattr(self.index, "hnsw", None)
+        if hnsw is None:
+            raise ValueError("Index is not an HNSW index")
+        hnsw.efSearch = ef_search
 
     def save_index(self, path: str = VECTOR_DB_PATH):
-        """Save FAISS index and metadata to disk"""
-        if self.index is None:
+        """Save FAISS index (if built) and metadata to disk"""
+        if self.index is None and not self.metadata_count:
             raise ValueError("No index to save")
 
         # Save FAISS index
-        faiss.write_index(self.index, f"{path}.index")
+        if self.index is not None:
+            faiss.write_index(self.index, f"{path}.index")
 
-        # Save metadata
-        with open(f"{path}.metadata", 'wb') as f:
-            pickle.dump(self.metadata, f)
+        # Save metadata as columnar arrays (no pickle)
+        with open(f"{path}.metadata.npz", 'wb') as f:
+            np.savez(f, **self.metadata_cols)
 
         print(f"💾 Saved vector database to {path}")
 
     def load_index(self, path: str = VECTOR_DB_PATH):
         """Load FAISS index and metadata from disk"""
         index_path = f"{path}.index"
-        metadata_path = f"{path}.metadata"
+        metadata_path = f"{path}.metadata.npz"
 
-        if not (Path(index_path).exists() and Path(metadata_path).exists()):
+        if not Path(metadata_path).exists():
             return False
 
-        # Load FAISS index
-        self.index = faiss.read_index(index_path)
+        # Load FAISS index if one has been built
+        if Path(index_path).exists():
+            self.index = faiss.read_index(index_path)
+            self.dimension = self.index.d
+        else:
+            self.index = None
 
-        # Load metadata
-        with open(metadata_path, 'rb') as f:
-            self.metadata = pickle.load(f)
+        # Load metadata columns
+        with np.load(metadata_path, allow_pickle=False) as columns:
+            self.metadata_cols = {col: columns[col] for col in columns.files}
+        self.metadata_count = len(next(iter(self.metadata_cols.values()), []))
 
-        print(f"📁 Loaded vector database with {self.index.ntotal} vectors")
+        vector_count = self.index.ntotal if self.index is not None else 0
+        print(f"📁 Loaded vector database with {vector_count} vectors")
         return True
 
-    def search(self, query_embedding: List[float], k: int = 5) -> List[Tuple[Dict[str, Any], float]]:
+    def search(self, query_embedding: Union[np.ndarray, List[float]], k: int = 5) -> List[Tuple[Dict[str, Any], float]]:
         """Search for similar vectors"""
         if self.index is None:
             raise ValueError("Index not loaded")
 
-        query_array = np.array([query_embedding], dtype=np.float32)
+        if self._query_buf.shape[1] != self.dimension:
+            self._query_buf = np.empty((1, self.dimension), dtype=np.float32)
+
+        # Copy into the preallocated buffer and normalize in place
+        if isinstance(query_embedding, np.ndarray):
+            np.copyto(self._query_buf[0], query_embedding, casting="same_kind")
+        else:
+            self._query_buf[0] = query_embedding
+        faiss.normalize_L2(self._query_buf)
+
+        scores, indices = self.index.search(self._query_buf, k)
+        return self._collect_results(scores[0], indices[0])
+
+    def search_batch(self, query_embeddings: np.ndarray, k: int = 5) -> List[List[Tuple[Dict[str, Any], float]]]:
+        """Search for similar vectors for many queries in a single FAISS call"""
+        if self.index is None:
+            raise ValueError("Index not loaded")
+
+        query_array = np.array(query_embeddings, dtype=np.float32, ndmin=2)
         faiss.normalize_L2(query_array)
 
         scores, indices = self.index.search(query_array, k)
+        return [self._collect_results(row_scores, row_indices) for row_scores, row_indices in zip(scores, indices)]
 
+    def _collect_results(self, scores, indices) -> List[Tuple[Dict[str, Any], float]]:
+        """Pair FAISS hits with their metadata, skipping empty (-1) slots"""
         results = []
-        for i, (score, idx) in enumerate(zip(scores[0], indices[0])):
-            if idx < len(self.metadata):
-                results.append((self.metadata[idx], float(score)))
+        for score, idx in zip(scores, indices):
+            if 0 <= idx < self.metadata_count:
+                results.append((self.get_metadata(idx), float(score)))
 
         return results
 
@@ -86,7 +204,7 @@ class VectorDatabase:
             "loaded": True,
             "total_vectors": self.index.ntotal,
             "dimension": self.dimension,
-            "metadata_count": len(self.metadata)
+            "metadata_count": self.metadata_count
         }
 
 
@@ -98,8 +216,8 @@ def build_vector_database():
         return False
 
     # Load embeddings data
-    with open(EMBEDDINGS_FILE, 'r') as f:
-        embeddings_data = json.load(f)
+    with open(EMBEDDINGS_FILE, 'rb') as f:
+        embeddings_data = orjson.loads(f.read())
 
     if not embeddings_data.get("videos"):
         print("❌ No video data found in embeddings file")
@@ -108,11 +226,10 @@ def build_vector_database():
     print("Building vector database...")
 
     # For this POC, we'll use Twelve Labs search directly
-    # FAISS can be used for custom embeddings if needed
+    # FAISS can be used for custom embeddings if needed: the index is
+    # created lazily on the first db.add(embeddings)
     db = VectorDatabase()
 
-    # Create dummy embeddings for structure (real embeddings come from Twelve Labs search)
-    dummy_embeddings = [np.random.rand(1024).tolist() for _ in embeddings_data["videos"]]
     metadata = [
         {
             "video_id": video["video_id"],
@@ -122,7 +239,7 @@ def build_vector_database():
         for video in embeddings_data["videos"]
     ]
 
-    db.create_index(dummy_embeddings, metadata)
+    db.create_empty_index(metadata)
     db.save_index()
 
     return True
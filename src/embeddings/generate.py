@@ -4,15 +4,21 @@ Generate embeddings for videos using Twelve Labs API
 """
 
 import os
-import json
-import time
+import asyncio
+import orjson
 import sys
 from pathlib import Path
 
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
 from src.embeddings.twelve_labs_client import TwelveLabsClient
-from config.settings import VIDEO_DATA_DIR, EMBEDDINGS_FILE
+from config.settings import VIDEO_DATA_DIR, EMBEDDINGS_FILE, MAX_CONCURRENT_UPLOADS
+
+VIDEO_EXTENSIONS = ('.mp4', '.mov', '.avi')
+
+# Task status polling backoff; rate-limited (HTTP 429) calls are retried by the client
+POLL_INITIAL_DELAY = 1.0
+POLL_MAX_DELAY = 30.0
 
 
 class EmbeddingGenerator:
@@ -26,13 +32,12 @@ class EmbeddingGenerator:
 
     def get_video_files(self):
         """Get list of video files from data directory"""
-        video_dir = Path(VIDEO_DATA_DIR)
-        video_extensions = {'.mp4', '.mov', '.avi'}
-
-        video_files = [
-            f for f in video_dir.iterdir()
-            if f.is_file() and f.suffix.lower() in video_extensions
-        ]
+        # scandir entries carry the file type, so is_file() needs no extra stat
+        with os.scandir(VIDEO_DATA_DIR) as entries:
+            video_files = [
+                Path(entry.path) for entry in entries
+                if entry.is_file() and entry.name.lower().endswith(VIDEO_EXTENSIONS)
+            ]
 
         return sorted(video_files)
 
@@ -81,23 +86,27 @@ class EmbeddingGenerator:
         result = self.client.upload_video(self.index_id, str(video_path))
 
         if not result["success"]:
-            print(f"❌ Upload failed: {result['error']}")
+            print(f"❌ Upload of {video_path.name} failed: {result['error']}")
             return None
 
         task_id = result["data"]["_id"]
-        print(f"✅ Video uploaded with task ID: {task_id}")
-        print("Waiting for processing...")
+        print(f"✅ {video_path.name} uploaded with task ID: {task_id}")
+        print(f"Waiting for processing of {video_path.name}...")
 
-        # Wait for the task to complete
-        wait_result = self.client.wait_for_task_completion(task_id)
+        # Wait for the task to complete; polls back off exponentially
+        wait_result = self.client.wait_for_task_completion(
+            task_id,
+            initial_delay=POLL_INITIAL_DELAY,
+            max_delay=POLL_MAX_DELAY
+        )
 
         if not wait_result["success"]:
-            print(f"❌ Video processing failed: {wait_result.get('error', 'Unknown error')}")
+            print(f"❌ Processing of {video_path.name} failed: {wait_result.get('error', 'Unknown error')}")
             return None
 
         # Get the video ID from the task completion result
         video_id = wait_result["data"]["video_id"]
-        print(f"✅ Video processing completed. Video ID: {video_id}")
+        print(f"✅ {video_path.name} processing completed. Video ID: {video_id}")
 
         video_data = {
             "video_id": video_id,
@@ -123,10 +132,10 @@ class EmbeddingGenerator:
         if not self.create_index():
             return False
 
-        for video_file in video_files:
-            print(f"\nProcessing {video_file.name}...")
+        # Upload and process videos concurrently
+        results = asyncio.run(self.upload_all(video_files))
 
-            video_data = self.upload_video(video_file)
+        for video_file, video_data in zip(video_files, results):
             if video_data:
                 self.embeddings_data["videos"].append(video_data)
             else:
@@ -138,16 +147,26 @@ class EmbeddingGenerator:
 
         return True
 
+    async def upload_all(self, video_files):
+        """Upload videos in parallel, bounded by MAX_CONCURRENT_UPLOADS"""
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_UPLOADS)
+
+        async def upload_one(video_file):
+            async with semaphore:
+                return await asyncio.to_thread(self.upload_video, video_file)
+
+        return await asyncio.gather(*(upload_one(f) for f in video_files))
+
     def save_embeddings(self):
         """Save embeddings data to JSON file"""
-        with open(EMBEDDINGS_FILE, 'w') as f:
-            json.dump(self.embeddings_data, f, indent=2)
+        with open(EMBEDDINGS_FILE, 'wb') as f:
+            f.write(orjson.dumps(self.embeddings_data, option=orjson.OPT_INDENT_2))
 
     def load_embeddings(self):
         """Load existing embeddings data"""
         if os.path.exists(EMBEDDINGS_FILE):
-            with open(EMBEDDINGS_FILE, 'r') as f:
-                self.embeddings_data = json.load(f)
+            with open(EMBEDDINGS_FILE, 'rb') as f:
+                self.embeddings_data = orjson.loads(f.read())
             return True
         return False
 
@@ -1,33 +1,267 @@
-from twelvelabs import TwelveLabs
+import asyncio
+import io
+import os
+import threading
+import time
+import httpx
+from itertools import islice
+from cachetools import TTLCache
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential_jitter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from twelvelabs import TwelveLabs, AsyncTwelveLabs
 from twelvelabs.indexes import IndexesCreateRequestModelsItem
-from typing import List, Dict, Any
+from dataclasses import dataclass, fields
+from typing import List, Dict, Any, Iterator, AsyncIterator, Optional, Tuple, Union
 import logging
 from config.settings import TWELVE_LABS_API_KEY
 
-# Configure logging
-logging.basicConfig(
-    level=logging.DEBUG,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler()  # Output to console
-    ]
-)
+# Logging is configured by the application entrypoint (API server, scripts)
 logger = logging.getLogger("twelvelabs_client")
 
 
+# HTTP connection pool shared by all SDK calls; HTTP/2 multiplexes concurrent
+# polls and searches over one TLS connection instead of opening one per request
+HTTP_TIMEOUT = 60.0  # The SDK's own default
+UPLOAD_TIMEOUT = 600.0  # Video uploads send the whole file in one request
+HTTP_RETRIES = 2
+HTTP_LIMITS = httpx.Limits(max_connections=200, max_keepalive_connections=100)
+
+# Read buffer for streaming video uploads from disk
+UPLOAD_BUFFER_SIZE = 1024 * 1024
+
+# Task states after which polling stops
+TASK_DONE_STATUSES = ("ready", "failed")
+
+# In-process cache for repeat reads of video info, which is immutable; task status
+# is always fetched fresh for pollers, and search results are cached by the API layer
+_video_info_cache = TTLCache(maxsize=4096, ttl=3600)
+_cache_lock = threading.Lock()
+
+
+def _cache_get(cache: TTLCache, key):
+    """Thread-safe cache lookup"""
+    with _cache_lock:
+        return cache.get(key)
+
+
+def _cache_set(cache: TTLCache, key, value):
+    """Thread-safe cache insert"""
+    with _cache_lock:
+        cache[key] = value
+
+
+# Retry transient SDK failures (connection errors, 429 and 5xx) on idempotent calls only;
+# uploads and index creation are never retried
+RETRY_ATTEMPTS = 4
+RETRY_INITIAL_DELAY = 0.2
+RETRY_MAX_DELAY = 5.0
+RETRY_AFTER_MAX = 30.0
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+def _is_transient(exc: BaseException) -> bool:
+    """Whether a failed SDK call is worth retrying"""
+    if isinstance(exc, httpx.TransportError):
+        return True
+    return getattr(exc, "status_code", None) in RETRY_STATUS_CODES
+
+
+def _retry_after(exc: BaseException):
+    """Seconds from the response's Retry-After header, or None"""
+    headers = getattr(exc, "headers", None) or {}
+    try:
+        return float(headers.get("retry-after") or headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        return None
+
+
+_jitter_wait = wait_exponential_jitter(initial=RETRY_INITIAL_DELAY, max=RETRY_MAX_DELAY)
+
+
+def _retry_wait(retry_state) -> float:
+    """Honour Retry-After when the server sends one, otherwise back off with jitter"""
+    retry_after = _retry_after(retry_state.outcome.exception())
+    if retry_after is not None:
+        return min(retry_after, RETRY_AFTER_MAX)
+    return _jitter_wait(retry_state)
+
+
+_retry_transient = retry(
+    stop=stop_after_attempt(RETRY_ATTEMPTS),
+    wait=_retry_wait,
+    retry=retry_if_exception(_is_transient),
+    reraise=True
+)
+
+
+def _is_rate_limited(exc: BaseException) -> bool:
+    """Whether the API rejected a call with HTTP 429"""
+    return getattr(exc, "status_code", None) == 429
+
+
+# A rate-limited (429) upload was rejected before reaching the index, so unlike
+# other failures it is safe to send again
+_retry_rate_limited = retry(
+    stop=stop_after_attempt(RETRY_ATTEMPTS),
+    wait=_retry_wait,
+    retry=retry_if_exception(_is_rate_limited),
+    reraise=True
+)
+
+
+def _rewind_media(search_params: Dict[str, Any]):
+    """Rewind an in-memory query file so a retried search uploads all of it"""
+    media = search_params.get("query_media_file")
+    if hasattr(media, "seek"):
+        media.seek(0)
+
+
+# Task polling backoff: first poll is immediate, then the delay grows by this factor
+POLL_INITIAL_DELAY = 0.25
+POLL_MAX_DELAY = 5.0
+POLL_BACKOFF_FACTOR = 1.7
+# Default bound on how long wait_for_many waits for each task, in seconds
+WAIT_FOR_MANY_DEADLINE = 3600.0
+
+
+@dataclass(frozen=True, slots=True)
+class SearchOpts:
+    """Search options validated once; unset optional fields are left out of the request"""
+    search_options: Tuple[str, ...] = ("visual", "audio")
+    threshold: str = "medium"
+    group_by: Optional[str] = None  # Can be "video" or None
+    operator: str = "or"
+    page_limit: int = 10
+    adjust_confidence_level: Optional[float] = None
+    sort_option: Optional[str] = None
+    filter: Optional[Dict[str, Any]] = None
+
+    def __post_init__(self):
+        # Keep search options as a tuple so equal options compare and hash equally
+        object.__setattr__(self, "search_options", tuple(self.search_options))
+
+    @classmethod
+    def coerce(cls, options, default_search_options: List[str] = None) -> "SearchOpts":
+        """Normalize None, an options dict or a SearchOpts into a SearchOpts"""
+        if isinstance(options, cls):
+            return options
+        options = options or {}
+        kwargs = {name: options[name] for name in _SEARCH_OPT_FIELDS if name in options}
+        if default_search_options is not None:
+            kwargs.setdefault("search_options", default_search_options)
+        return cls(**kwargs)
+
+    def to_params(self) -> Dict[str, Any]:
+        """SDK search parameters for these options, without None values"""
+        params = {name: getattr(self, name) for name in _SEARCH_OPT_FIELDS}
+        params["search_options"] = list(self.search_options)
+        return {k: v for k, v in params.items() if v is not None}
+
+
+_SEARCH_OPT_FIELDS = tuple(field.name for field in fields(SearchOpts))
+
+
+def _task_result(task) -> Dict[str, Any]:
+    """Build the result dict for a finished indexing task"""
+    if task.status != "ready":
+        return {"success": False, "error": f"Indexing failed with status {task.status}"}
+    return {"success": True, "data": {"video_id": task.video_id, "status": task.status}}
+
+
+# dir() listings per type, so debug logging introspects each result type only once
+_DIR_CACHE: Dict[type, List[str]] = {}
+
+
+def _cached_dir(obj) -> List[str]:
+    """dir(obj), computed once per type"""
+    obj_type = type(obj)
+    names = _DIR_CACHE.get(obj_type)
+    if names is None:
+        names = _DIR_CACHE[obj_type] = dir(obj)
+    return names
+
+
+# Clip attributes read for every search result, with defaults for missing ones;
+# several (confidence, score, filename) are absent on SDK search items
+_CLIP_FIELDS = tuple(zip(
+    ("video_id", "confidence", "score", "start", "end", "filename", "transcription", "thumbnail_url"),
+    ("", 0.0, 0.0, 0.0, 0.0, "unknown", "", "")
+))
+
+
+def _clip_values(clip) -> Tuple:
+    """Fetch all clip fields in one pass, using the default for any missing attribute"""
+    return tuple(getattr(clip, field, default) for field, default in _CLIP_FIELDS)
+
+
+def _clip_to_dict(clip) -> Dict[str, Any]:
+    """Build the result dict for a single clip"""
+    video_id, confidence, score, start, end, filename, transcription, thumbnail_url = _clip_values(clip)
+    return {
+        "video_id": video_id,
+        "confidence": confidence,
+        "score": score,
+        "start": start,
+        "end": end,
+        "metadata": {"filename": filename},
+        "clip_text": transcription,
+        "thumbnail_url": thumbnail_url
+    }
+
+
+def _convert_item(item) -> List[Dict[str, Any]]:
+    """Convert one SDK search item (clip or grouped video) into result dicts"""
+    # Grouped results (group_by="video") carry their clips
+    if hasattr(item, 'id') and hasattr(item, 'clips') and item.clips:
+        return [_clip_to_dict(clip) for clip in item.clips]
+    return [_clip_to_dict(item)]
+
+
 class TwelveLabsClient:
-    def __init__(self):
-        self.client = TwelveLabs(api_key=TWELVE_LABS_API_KEY)
+    # SDK client and connection pool shared by every instance, created on first use
+    _sdk = None
+    _session = None
+    _sdk_lock = threading.Lock()
+
+    @classmethod
+    def _get_sdk(cls) -> TwelveLabs:
+        """Return the shared SDK client, creating it and its HTTP pool on first use"""
+        sdk = cls._sdk
+        if sdk is None:
+            with cls._sdk_lock:
+                sdk = cls._sdk
+                if sdk is None:
+                    # Keep one pooled HTTP client so TCP/TLS connections are reused across calls
+                    transport = httpx.HTTPTransport(http2=True, retries=HTTP_RETRIES, limits=HTTP_LIMITS)
+                    cls._session = httpx.Client(transport=transport, timeout=HTTP_TIMEOUT)
+                    sdk = cls._sdk = TwelveLabs(api_key=TWELVE_LABS_API_KEY, httpx_client=cls._session)
+        return sdk
+
+    @classmethod
+    def reset_sdk(cls):
+        """Close the shared HTTP pool and drop the SDK client; the next call recreates it"""
+        with cls._sdk_lock:
+            if cls._session is not None:
+                cls._session.close()
+            cls._sdk = None
+            cls._session = None
+
+    @property
+    def client(self) -> TwelveLabs:
+        return self._get_sdk()
+
+    def close(self):
+        """Close the pooled HTTP connections"""
+        self.reset_sdk()
 
     def test_connection(self) -> Dict[str, Any]:
         """Test API connectivity"""
         try:
-            # Test by listing indexes (should work if API key is valid)
-            indexes = self.client.indexes.list()
-            print("Available Clients:")
-            for client in indexes:
-                print(f" - {client.index_name}")
-            return {"success": True, "data": list(indexes)}
+            # Test by listing indexes (should work if API key is valid); the pager is walked once
+            indexes = list(self.client.indexes.list())
+            for index in indexes:
+                logger.info("Available index: %s", index.index_name)
+            return {"success": True, "data": indexes}
         except Exception as e:
             return {"success": False, "error": str(e)}
 
@@ -60,246 +294,374 @@ class TwelveLabsClient:
     def upload_video(self, index_id: str, video_path: str, language: str = "en") -> Dict[str, Any]:
         """Upload a video to the index"""
         try:
-            # Open the file as a binary file object
-            with open(video_path, 'rb') as file_obj:
+            size = os.path.getsize(video_path)
+            logger.info("Uploading %s (%d bytes)", video_path, size)
+
+            # Open the file as a binary file object; the SDK streams the multipart
+            # body from the handle in UPLOAD_BUFFER_SIZE reads instead of loading it
+            with open(video_path, 'rb', buffering=UPLOAD_BUFFER_SIZE) as file_obj:
                 # Pass the open file object to the SDK
-                task = self.client.tasks.create(
-                    index_id=index_id,
-                    video_file=file_obj,
-                )
+                task = self._create_task(index_id, file_obj)
                 
                 print(f"Upload complete. The unique identifier of your video is {task.video_id}. And the task ID is {task.id}.")
                 return {"success": True, "data": {"_id": task.id}}
         except Exception as e:
             return {"success": False, "error": str(e)}
 
+    @_retry_rate_limited
+    def _create_task(self, index_id: str, file_obj):
+        file_obj.seek(0)  # A retried upload resends the whole file
+        return self.client.tasks.create(
+            index_id=index_id,
+            video_file=file_obj,
+            request_options={"timeout_in_seconds": UPLOAD_TIMEOUT}
+        )
+
+    @_retry_transient
+    def _retrieve_task(self, task_id: str):
+        return self.client.tasks.retrieve(task_id)
+
+    @_retry_transient
+    def _retrieve_video(self, video_id: str):
+        return self.client.videos.retrieve(video_id)
+
+    @_retry_transient
+    def _search_query(self, search_params: Dict[str, Any]):
+        _rewind_media(search_params)
+        return self.client.search.query(**search_params)
+
     def get_task_status(self, task_id: str) -> Dict[str, Any]:
         """Check video processing task status"""
         try:
-            task = self.client.tasks.retrieve(task_id)
+            task = self._retrieve_task(task_id)
             return {"success": True, "data": {"status": task.status, "video_id": task.video_id}}
         except Exception as e:
             return {"success": False, "error": str(e)}
 
     def get_video_info(self, video_id: str) -> Dict[str, Any]:
-        """Get video information"""
+        """Get video information (cached, video metadata does not change)"""
+        cached = _cache_get(_video_info_cache, video_id)
+        if cached is not None:
+            return cached
         try:
-            video = self.client.videos.retrieve(video_id)
-            return {"success": True, "data": {"id": video.id, "filename": video.metadata.filename if hasattr(video, 'metadata') and video.metadata else "unknown"}}
+            video = self._retrieve_video(video_id)
+            result = {"success": True, "data": {"id": video.id, "filename": video.metadata.filename if hasattr(video, 'metadata') and video.metadata else "unknown"}}
+            _cache_set(_video_info_cache, video_id, result)
+            return result
         except Exception as e:
             return {"success": False, "error": str(e)}
             
-    def wait_for_task_completion(self, task_id: str, sleep_interval: float = 5.0) -> Dict[str, Any]:
-        """Wait for a video indexing task to complete"""
+    def wait_for_task_completion(self, task_id: str, initial_delay: float = POLL_INITIAL_DELAY,
+                                 max_delay: float = POLL_MAX_DELAY, deadline: float = None) -> Dict[str, Any]:
+        """Wait for a video indexing task to complete
+
+        Polls with exponential backoff from initial_delay up to max_delay.
+        deadline bounds the total wait in seconds (None waits forever).
+        """
         try:
-            # Use the SDK's wait_for_done method
-            task = self.client.tasks.wait_for_done(
-                task_id=task_id,
-                sleep_interval=sleep_interval,
-                callback=lambda t: print(f"  Status={t.status}")
-            )
-            
-            if task.status != "ready":
-                return {"success": False, "error": f"Indexing failed with status {task.status}"}
-                
-            return {"success": True, "data": {"video_id": task.video_id, "status": task.status}}
+            started = time.monotonic()
+            delay = initial_delay
+            while True:
+                task = self._retrieve_task(task_id)
+                print(f"  Status={task.status}")
+                if task.status in TASK_DONE_STATUSES:
+                    return _task_result(task)
+
+                if deadline is not None and time.monotonic() - started + delay > deadline:
+                    return {"success": False, "error": f"Timed out after {deadline}s waiting for task {task_id}"}
+                time.sleep(delay)
+                delay = min(delay * POLL_BACKOFF_FACTOR, max_delay)
         except Exception as e:
             return {"success": False, "error": str(e)}
 
-    def search_text(self, index_id: str, query: str, options: Dict[str, Any] = None) -> Dict[str, Any]:
-        """Search videos with text query"""
+    def wait_for_many(self, task_ids: List[str], sleep_interval: float = POLL_MAX_DELAY,
+                      deadline: float = WAIT_FOR_MANY_DEADLINE) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Wait for many indexing tasks in parallel, yielding (task_id, result) as each finishes
+
+        deadline bounds each task's wait in seconds; tasks still running then
+        report a timeout.
+        """
+        if not task_ids:
+            return
+        executor = ThreadPoolExecutor(max_workers=min(32, len(task_ids)))
         try:
-            # Set up default options if none provided
-            if options is None:
-                options = {}
-            
-            logger.debug(f"Search query: '{query}' for index_id: {index_id}")
-            logger.debug(f"Search options: {options}")
-            
-            # Prepare search parameters based on documentation
-            search_params = {
-                "index_id": index_id,
-                "query_text": query,
-                "search_options": options.get("search_options", ["visual", "audio"]),
-                "threshold": options.get("threshold", "medium"),
-                "group_by": options.get("group_by", None),  # Can be "video" or None
-                "operator": options.get("operator", "or"),
-                "page_limit": options.get("page_limit", 10)
+            futures = {
+                executor.submit(self.wait_for_task_completion, task_id, max_delay=sleep_interval, deadline=deadline): task_id
+                for task_id in task_ids
             }
-            
-            # Add optional parameters only if they're provided
-            if "adjust_confidence_level" in options:
-                search_params["adjust_confidence_level"] = options["adjust_confidence_level"]
-            
-            if "sort_option" in options:
-                search_params["sort_option"] = options["sort_option"]
-                
-            if "filter" in options:
-                search_params["filter"] = options["filter"]
-            
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+        finally:
+            # If the caller stops early, don't block on the remaining polls; queued
+            # ones are cancelled and running ones end at their deadline
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _iter_items(self, search_results) -> Iterator[Dict[str, Any]]:
+        """Yield one result dict per clip as search items arrive"""
+        _debug = logger.isEnabledFor(logging.DEBUG)
+        for item_count, item in enumerate(search_results, 1):
+            if _debug:
+                logger.debug("Processing result item %d", item_count)
+                logger.debug("Item type: %s", type(item))
+                logger.debug("Item dir: %s", _cached_dir(item))
+            yield from _convert_item(item)
+
+    def _build_search_params(self, index_id: str, options, default_search_options: List[str]) -> Dict[str, Any]:
+        """Prepare the search parameters shared by text and image queries"""
+        search_params = SearchOpts.coerce(options, default_search_options).to_params()
+        search_params["index_id"] = index_id
+        return search_params
+
+    def _execute_search(self, search_params: Dict[str, Any], log_label: str, stream: bool = False) -> Dict[str, Any]:
+        """Run a search query and convert its results; shared by text and image search"""
+        try:
             # Remove None values to avoid SDK errors
             search_params = {k: v for k, v in search_params.items() if v is not None}
-            logger.debug(f"Final search parameters: {search_params}")
-            
+            logger.debug("Final %s search parameters: %s", log_label, search_params)
+
             # Execute the search
-            logger.info("Executing search...")
-            search_results = self.client.search.query(**search_params)
-            logger.info("Search executed successfully")
-            
+            logger.info("Executing %s search...", log_label)
+            search_results = self._search_query(search_params)
+            logger.info("%s search executed successfully", log_label.capitalize())
+
             # Inspect the search results structure
-            logger.debug(f"Search results type: {type(search_results)}")
-            logger.debug(f"Search results dir: {dir(search_results)}")
-            
-            # Convert to our expected format
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Search results type: %s", type(search_results))
+                logger.debug("Search results dir: %s", _cached_dir(search_results))
+
+            # The pager fetches further pages on demand; stop once page_limit clips are read
+            items = islice(self._iter_items(search_results), search_params.get("page_limit"))
+            if stream:
+                return {"success": True, "data": {"data": items}}
+
+            # Materialize for callers that expect a list; keep whatever converted before an error
             results = []
-            
-            # For debugging, try to inspect the first few results
             try:
-                item_count = 0
-                for item in search_results:
-                    item_count += 1
-                    logger.debug(f"Processing result item {item_count}")
-                    logger.debug(f"Item type: {type(item)}")
-                    logger.debug(f"Item dir: {dir(item)}")
-                    
-                    # Handle grouped results (when group_by="video")
-                    if hasattr(item, 'id') and hasattr(item, 'clips') and item.clips:
-                        logger.debug(f"Item is a grouped result with {len(item.clips)} clips")
-                        for clip in item.clips:
-                            results.append({
-                                "video_id": clip.video_id,
-                                "confidence": getattr(clip, 'confidence', 0.0),
-                                "score": getattr(clip, 'score', 0.0),
-                                "start": getattr(clip, 'start', 0.0),
-                                "end": getattr(clip, 'end', 0.0),
-                                "metadata": {"filename": getattr(clip, 'filename', 'unknown')},
-                                "clip_text": getattr(clip, 'transcription', ''),
-                                "thumbnail_url": getattr(clip, 'thumbnail_url', '')
-                            })
-                    # Handle individual results
-                    else:
-                        logger.debug(f"Item is an individual result")
-                        logger.debug(f"Item video_id: {getattr(item, 'video_id', 'Not found')}")
-                        logger.debug(f"Item confidence: {getattr(item, 'confidence', 'Not found')}")
-                        
-                        results.append({
-                            "video_id": getattr(item, 'video_id', ''),
-                            "confidence": getattr(item, 'confidence', 0.0),
-                            "score": getattr(item, 'score', 0.0),
-                            "start": getattr(item, 'start', 0.0),
-                            "end": getattr(item, 'end', 0.0),
-                            "metadata": {"filename": getattr(item, 'filename', 'unknown')},
-                            "clip_text": getattr(item, 'transcription', ''),
-                            "thumbnail_url": getattr(item, 'thumbnail_url', '')
-                        })
-                        
-                    # Limit the number of items processed for debugging
-                    if item_count >= 5:
-                        logger.debug("Limiting to first 5 results for debugging")
-                        break
+                results.extend(items)
             except Exception as e:
-                logger.error(f"Error processing search results: {str(e)}")
-            
-            logger.info(f"Total results processed: {len(results)}")
+                logger.error("Error processing %s search results: %s", log_label, e)
+
+            logger.info("Total %s search results processed: %d", log_label, len(results))
             return {"success": True, "data": {"data": results}}
         except Exception as e:
-            import traceback
-            logger.error(f"Search failed with exception: {str(e)}")
-            logger.error(f"Exception type: {type(e)}")
-            logger.error(f"Traceback: {traceback.format_exc()}")
+            logger.exception("%s search failed with %s: %s", log_label.capitalize(), type(e).__name__, e)
             return {"success": False, "error": str(e)}
-            
-    def search_image(self, index_id: str, image_file, options: Dict[str, Any] = None) -> Dict[str, Any]:
-        """Search videos with image query"""
+
+    def search_text(self, index_id: str, query: str, options: Union[SearchOpts, Dict[str, Any]] = None,
+                    stream: bool = False) -> Dict[str, Any]:
+        """Search videos with text query; stream=True returns results as a lazy iterator"""
+        logger.debug("Search query: '%s' for index_id: %s", query, index_id)
+        logger.debug("Search options: %s", options)
+
+        search_params = self._build_search_params(index_id, options, ["visual", "audio"])
+        search_params["query_text"] = query
+
+        return self._execute_search(search_params, "text", stream=stream)
+
+    def search_image(self, index_id: str, image_file, options: Union[SearchOpts, Dict[str, Any]] = None,
+                     stream: bool = False) -> Dict[str, Any]:
+        """Search videos with image query; stream=True returns results as a lazy iterator"""
+        logger.debug("Image search for index_id: %s", index_id)
+        logger.debug("Search options: %s", options)
+
+        # Read the upload once into memory so the SDK sends a sized in-memory body
+        # that retries can rewind
+        if hasattr(image_file, "read"):
+            image_file = io.BytesIO(image_file.read())
+
+        search_params = self._build_search_params(index_id, options, ["visual"])
+        search_params["query_media_type"] = "image"
+        search_params["query_media_file"] = image_file  # This is the file object
+
+        return self._execute_search(search_params, "image", stream=stream)
+
+
+class AsyncTwelveLabsClient:
+    """Async variant of TwelveLabsClient for use inside an event loop
+
+    Every API call is awaitable, so one event loop thread can serve many
+    concurrent searches and uploads. Results use the same dict format as
+    TwelveLabsClient.
+    """
+
+    def __init__(self):
+        transport = httpx.AsyncHTTPTransport(http2=True, retries=HTTP_RETRIES, limits=HTTP_LIMITS)
+        self._session = httpx.AsyncClient(transport=transport, timeout=HTTP_TIMEOUT)
+        self.client = AsyncTwelveLabs(api_key=TWELVE_LABS_API_KEY, httpx_client=self._session)
+
+    async def close(self):
+        """Close the pooled HTTP connections"""
+        await self._session.aclose()
+
+    async def test_connection(self) -> Dict[str, Any]:
+        """Test API connectivity"""
+        try:
+            indexes = [index async for index in await self.client.indexes.list()]
+            return {"success": True, "data": indexes}
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+
+    async def create_index(self, index_name: str) -> Dict[str, Any]:
+        """Create a new index for videos"""
+        try:
+            models = [
+                IndexesCreateRequestModelsItem(
+                    model_name="marengo2.7",
+                    model_options=["visual", "audio"],
+                ),
+                IndexesCreateRequestModelsItem(
+                    model_name="pegasus1.2",
+                    model_options=["visual", "audio"],
+                ),
+            ]
+
+            index = await self.client.indexes.create(index_name=index_name, models=models)
+            return {"success": True, "data": {"_id": index.id, "name": index_name}}
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+
+    async def upload_video(self, index_id: str, video_path: str) -> Dict[str, Any]:
+        """Upload a video to the index"""
+        try:
+            # Open off the event loop; httpx streams the file body from the handle
+            file_obj = await asyncio.to_thread(open, video_path, 'rb', UPLOAD_BUFFER_SIZE)
+            try:
+                task = await self.client.tasks.create(
+                    index_id=index_id,
+                    video_file=file_obj,
+                    request_options={"timeout_in_seconds": UPLOAD_TIMEOUT}
+                )
+            finally:
+                file_obj.close()
+            return {"success": True, "data": {"_id": task.id}}
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+
+    @_retry_transient
+    async def _retrieve_task(self, task_id: str):
+        return await self.client.tasks.retrieve(task_id)
+
+    @_retry_transient
+    async def _retrieve_video(self, video_id: str):
+        return await self.client.videos.retrieve(video_id)
+
+    @_retry_transient
+    async def _search_query(self, search_params: Dict[str, Any]):
+        _rewind_media(search_params)
+        return await self.client.search.query(**search_params)
+
+    async def get_task_status(self, task_id: str) -> Dict[str, Any]:
+        """Check video processing task status"""
+        try:
+            task = await self._retrieve_task(task_id)
+            return {"success": True, "data": {"status": task.status, "video_id": task.video_id}}
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+
+    async def get_video_info(self, video_id: str) -> Dict[str, Any]:
+        """Get video information"""
+        try:
+            video = await self._retrieve_video(video_id)
+            return {"success": True, "data": {"id": video.id, "filename": video.metadata.filename if hasattr(video, 'metadata') and video.metadata else "unknown"}}
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+
+    async def wait_for_task_completion(self, task_id: str, initial_delay: float = POLL_INITIAL_DELAY,
+                                       max_delay: float = POLL_MAX_DELAY, deadline: float = None) -> Dict[str, Any]:
+        """Wait for a video indexing task to complete without blocking the event loop
+
+        Same backoff and deadline behaviour as TwelveLabsClient.wait_for_task_completion.
+        """
+        try:
+            started = time.monotonic()
+            delay = initial_delay
+            while True:
+                task = await self._retrieve_task(task_id)
+                if task.status in TASK_DONE_STATUSES:
+                    return _task_result(task)
+
+                if deadline is not None and time.monotonic() - started + delay > deadline:
+                    return {"success": False, "error": f"Timed out after {deadline}s waiting for task {task_id}"}
+                await asyncio.sleep(delay)
+                delay = min(delay * POLL_BACKOFF_FACTOR, max_delay)
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+
+    async def wait_for_many(self, task_ids: List[str], sleep_interval: float = POLL_MAX_DELAY) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """Poll many indexing tasks together, yielding (task_id, result) as each finishes
+
+        Each tick retrieves all outstanding tasks concurrently; finished
+        tasks are dropped from the poll set so later ticks get cheaper.
+        """
+        pending = list(dict.fromkeys(task_ids))
+        while pending:
+            tasks = await asyncio.gather(
+                *(self._retrieve_task(task_id) for task_id in pending),
+                return_exceptions=True
+            )
+
+            still_pending = []
+            for task_id, task in zip(pending, tasks):
+                if isinstance(task, Exception):
+                    yield task_id, {"success": False, "error": str(task)}
+                elif task.status in TASK_DONE_STATUSES:
+                    yield task_id, _task_result(task)
+                else:
+                    still_pending.append(task_id)
+
+            pending = still_pending
+            if pending:
+                await asyncio.sleep(sleep_interval)
+
+    async def _query(self, search_params: Dict[str, Any]) -> Dict[str, Any]:
+        """Run a search query and convert the results"""
         try:
-            # Set up default options if none provided
-            if options is None:
-                options = {}
-            
-            logger.debug(f"Image search for index_id: {index_id}")
-            logger.debug(f"Search options: {options}")
-            
-            # Prepare search parameters based on documentation
-            search_params = {
-                "index_id": index_id,
-                "query_media_type": "image",
-                "query_media_file": image_file,  # This is the file object
-                "search_options": options.get("search_options", ["visual"]),
-                "threshold": options.get("threshold", "medium"),
-                "group_by": options.get("group_by", None),  # Can be "video" or None
-                "operator": options.get("operator", "or"),
-                "page_limit": options.get("page_limit", 10)
-            }
-            
-            # Add optional parameters only if they're provided
-            if "adjust_confidence_level" in options:
-                search_params["adjust_confidence_level"] = options["adjust_confidence_level"]
-            
-            if "sort_option" in options:
-                search_params["sort_option"] = options["sort_option"]
-                
-            if "filter" in options:
-                search_params["filter"] = options["filter"]
-            
-            # Remove None values to avoid SDK errors
             search_params = {k: v for k, v in search_params.items() if v is not None}
-            logger.debug(f"Final image search parameters: {search_params}")
-            
-            # Execute the search
-            logger.info("Executing image search...")
-            search_results = self.client.search.query(**search_params)
-            logger.info("Image search executed successfully")
-            
-            # Convert to our expected format
+            search_results = await self._search_query(search_params)
+
+            page_limit = search_params.get("page_limit")
             results = []
-            
-            # For debugging, try to inspect the first few results
-            try:
-                item_count = 0
-                for item in search_results:
-                    item_count += 1
-                    logger.debug(f"Processing result item {item_count}")
-                    logger.debug(f"Item type: {type(item)}")
-                    logger.debug(f"Item dir: {dir(item)}")
-                    
-                    # Handle grouped results (when group_by="video")
-                    if hasattr(item, 'id') and hasattr(item, 'clips') and item.clips:
-                        logger.debug(f"Item is a grouped result with {len(item.clips)} clips")
-                        for clip in item.clips:
-                            results.append({
-                                "video_id": clip.video_id,
-                                "confidence": getattr(clip, 'confidence', 0.0),
-                                "score": getattr(clip, 'score', 0.0),
-                                "start": getattr(clip, 'start', 0.0),
-                                "end": getattr(clip, 'end', 0.0),
-                                "metadata": {"filename": getattr(clip, 'filename', 'unknown')},
-                                "clip_text": getattr(clip, 'transcription', ''),
-                                "thumbnail_url": getattr(clip, 'thumbnail_url', '')
-                            })
-                    # Handle individual results
-                    else:
-                        logger.debug(f"Item is an individual result")
-                        logger.debug(f"Item video_id: {getattr(item, 'video_id', 'Not found')}")
-                        logger.debug(f"Item confidence: {getattr(item, 'confidence', 'Not found')}")
-                        
-                        results.append({
-                            "video_id": getattr(item, 'video_id', ''),
-                            "confidence": getattr(item, 'confidence', 0.0),
-                            "score": getattr(item, 'score', 0.0),
-                            "start": getattr(item, 'start', 0.0),
-                            "end": getattr(item, 'end', 0.0),
-                            "metadata": {"filename": getattr(item, 'filename', 'unknown')},
-                            "clip_text": getattr(item, 'transcription', ''),
-                            "thumbnail_url": getattr(item, 'thumbnail_url', '')
-                        })
-            except Exception as e:
-                logger.error(f"Error processing image search results: {str(e)}")
-            
-            logger.info(f"Total image search results processed: {len(results)}")
+            async for item in search_results:
+                results.extend(_convert_item(item))
+                if page_limit is not None and len(results) >= page_limit:
+                    del results[page_limit:]
+                    break
             return {"success": True, "data": {"data": results}}
         except Exception as e:
-            import traceback
-            logger.error(f"Image search failed with exception: {str(e)}")
-            logger.error(f"Exception type: {type(e)}")
-            logger.error(f"Traceback: {traceback.format_exc()}")
-            return {"success": False, "error": str(e)}
\ No newline at end of file
+            logger.error("Async search failed: %s", e)
+            return {"success": False, "error": str(e)}
+
+    def _text_params(self, index_id: str, query: str, options) -> Dict[str, Any]:
+        """Build text search parameters, dropping unset options"""
+        search_params = SearchOpts.coerce(options, ["visual", "audio"]).to_params()
+        search_params["index_id"] = index_id
+        search_params["query_text"] = query
+        return search_params
+
+    async def search_text(self, index_id: str, query: str, options: Union[SearchOpts, Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Search videos with text query"""
+        return await self._query(self._text_params(index_id, query, options))
+
+    async def search_text_paginated(self, index_id: str, query: str, max_results: int = 100,
+                                    options: Union[SearchOpts, Dict[str, Any]] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Yield text search results across pages until max_results have been produced
+
+        The SDK pager follows next_page_token itself, so a following page is
+        only requested once the current one has been consumed.
+        """
+        search_results = await self._search_query(self._text_params(index_id, query, options))
+        produced = 0
+        async for item in search_results:
+            for result in _convert_item(item):
+                yield result
+                produced += 1
+                if produced >= max_results:
+                    return
+
+    async def search_image(self, index_id: str, image_file, options: Union[SearchOpts, Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Search videos with image query"""
+        search_params = SearchOpts.coerce(options, ["visual"]).to_params()
+        search_params["index_id"] = index_id
+        search_params["query_media_type"] = "image"
+        search_params["query_media_file"] = image_file
+        return await self._query(search_params)
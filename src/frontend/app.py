@@ -1,11 +1,28 @@
+import bisect
 import streamlit as st
 import requests
-import json
+import orjson
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import functools
+import hashlib
+import mmap
+import queue
+import shutil
+import subprocess
 import sys
+import threading
 import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from io import BytesIO
 from pathlib import Path
+from PIL import Image
 
-sys.path.append(str(Path(__file__).parent.parent.parent))
+# Make the project root importable under `streamlit run`; Streamlit re-executes this
+# script on every interaction, so only add it the first time
+PROJECT_ROOT = str(Path(__file__).resolve().parent.parent.parent)
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
 
 from config.settings import EMBEDDINGS_FILE
 
@@ -16,69 +33,633 @@ st.set_page_config(
     layout="wide"
 )
 
-# API endpoint
-API_BASE = "http://localhost:8000"
+# API endpoint and HTTP pool sizing, overridable from the environment
+API_BASE = os.getenv("API_BASE", "http://localhost:8000").rstrip("/")
+# Base URL the browser uses for media and download links; differs from API_BASE
+# when the frontend reaches the API over an internal address
+API_PUBLIC_BASE = os.getenv("API_PUBLIC_BASE", API_BASE).rstrip("/")
+API_POOL_CONNECTIONS = int(os.getenv("API_POOL_CONNECTIONS", "10"))
+API_POOL_MAXSIZE = int(os.getenv("API_POOL_MAXSIZE", "20"))
+
+# (connect, read) timeouts in seconds; a short connect timeout fails fast when the API is down
+HEALTH_TIMEOUT = (1, 2)
+SEARCH_TIMEOUT = (3, 15)
+IMAGE_SEARCH_TIMEOUT = (3, 60)  # Longer read timeout for image uploads
+
+# ffprobe is optional; without it full-video durations are not shown
+FFPROBE = shutil.which("ffprobe")
+
+# Text searches already queued together (from concurrent sessions) are sent as one
+# /batch-search request of up to BATCH_MAX_SIZE; a lone search goes straight to /search
+BATCH_MAX_SIZE = 8
+
+# Image uploads are downscaled to this long edge and re-encoded as JPEG before
+# upload; the embedding model works at a lower resolution anyway
+UPLOAD_MAX_EDGE = 1024
+UPLOAD_JPEG_QUALITY = 85
+
+# Example queries searched in one batch at startup so they answer from the API's cache
+EXAMPLE_QUERIES = ["person talking", "outdoor scene", "laughter", "office meeting"]
+
+# Results rendered with their video preview open; later ones create the player
+# and details only when their "Show preview" toggle is switched on
+OPEN_PREVIEWS = 2
+
+# Styles for the search result cards
+_RESULT_CSS = """
+<style>
+.result-card {
+    border: 1px solid #eaeaea;
+    border-radius: 6px;
+    padding: 0;
+    margin-bottom: 20px;
+    background-color: white;
+    box-shadow: 0 1px 3px rgba(0,0,0,0.05);
+}
+.result-header {
+    background-color: #f5f5f5;
+    color: #333;
+    padding: 8px 12px;
+    margin: 0;
+    border-top-left-radius: 6px;
+    border-top-right-radius: 6px;
+    border-bottom: 1px solid #eaeaea;
+    font-weight: 500;
+}
+.result-content {
+    padding: 12px;
+}
+.text-block {
+    background-color: #fafafa;
+    border-radius: 4px;
+    padding: 8px 10px;
+    margin-bottom: 10px;
+    border-left: 2px solid #ccc;
+    font-size: 14px;
+}
+.confidence-indicator {
+    font-weight: 500;
+    display: inline-block;
+    padding: 3px 8px;
+    border-radius: 4px;
+    color: white;
+    font-size: 12px;
+    letter-spacing: 0.3px;
+}
+.result-row {
+    display: flex;
+    gap: 16px;
+}
+.result-text {
+    flex: 2;
+}
+.result-confidence {
+    flex: 1;
+    text-align: center;
+}
+.result-time {
+    flex: 1;
+}
+.result-caption {
+    color: #808495;
+    font-size: 14px;
+}
+.high-confidence {
+    background-color: #27ae60;
+}
+.medium-confidence {
+    background-color: #f39c12;
+}
+.low-confidence {
+    background-color: #e74c3c;
+}
+</style>
+"""
+
+# Static part of a result card; widgets (video, details, download) follow it
+_CARD_HTML = (
+    '<div class="result-card">'
+    '<div class="result-header"><h3>Result {i}: {filename}</h3></div>'
+    '<div class="result-content result-row">'
+    '<div class="result-text">{text_block}</div>'
+    '<div class="result-confidence">'
+    '<p><strong>Confidence</strong></p>'
+    '<div class="confidence-indicator {confidence_class}">{confidence_display}</div>'
+    '</div>'
+    '<div class="result-time">{time_block}</div>'
+    '</div>'
+    '</div>'
+)
+# Card footer (video id, match score, file), one row under the widgets
+_FOOTER_HTML = (
+    '<div class="result-row result-caption">'
+    '<div class="result-time">Video ID: <code>{video_id}</code></div>'
+    '<div class="result-time">Match Score: {score}</div>'
+    '<div class="result-time">File: {filename}</div>'
+    '</div>'
+)
+_NO_TEXT_HTML = (
+    '<div class="text-block" style="color: #666;">'
+    '<em>No text transcript available</em>'
+    '</div>'
+)
+
+# Empty result card shown while a search is running
+_SKELETON_CARD = (
+    '<div class="result-card">'
+    '<div class="result-header">&nbsp;</div>'
+    '<div class="result-content" style="height: 120px;"></div>'
+    '</div>'
+)
+
+
+# Confidence badge lookup: labels map straight to a CSS class, numeric scores are
+# bucketed with bisect (<= 0.4 low, <= 0.7 medium, above that high)
+_CONFIDENCE_CLASSES = {
+    "high": "high-confidence",
+    "medium": "medium-confidence",
+    "low": "low-confidence"
+}
+_CONFIDENCE_BINS = [0.4, 0.7]
+_CONFIDENCE_LABELS = ["low", "medium", "high"]
+
+
+def confidence_badge(confidence_value):
+    """Return (display text, CSS class) for a string label or numeric confidence"""
+    if isinstance(confidence_value, str):
+        return confidence_value, _CONFIDENCE_CLASSES.get(confidence_value.lower(), "")
+    label = _CONFIDENCE_LABELS[bisect.bisect_left(_CONFIDENCE_BINS, confidence_value)]
+    return label, _CONFIDENCE_CLASSES[label]
 
 
-def load_video_data():
-    """Load video metadata"""
+def _text_html(clip_text):
+    """Transcript block for a result card"""
+    if not clip_text:
+        return _NO_TEXT_HTML
+    return f'<div class="text-block"><strong>Text:</strong> {clip_text}</div>'
+
+
+def _time_html(has_clip, start_time, end_time, video_duration):
+    """Clip timing block for a result card"""
+    if has_clip:
+        # Format as minutes:seconds if duration is long enough
+        if end_time >= 60:
+            span = f"{int(start_time//60)}:{int(start_time%60):02d} - {int(end_time//60)}:{int(end_time%60):02d}"
+        else:
+            span = f"{start_time:.1f}s - {end_time:.1f}s"
+        return (
+            f'<p><strong>Time:</strong> {span}</p>'
+            f'<p class="result-caption">Duration: {end_time - start_time:.1f}s</p>'
+        )
+    # Duration probed up front for all results
+    if video_duration is not None:
+        return f'<p><strong>Full video</strong></p><p class="result-caption">Duration: {video_duration:.1f}s</p>'
+    return '<p><strong>Full video</strong></p>'
+
+
+@st.cache_resource
+def get_session():
+    """Pooled HTTP session shared across reruns so API calls reuse keep-alive connections"""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=API_POOL_CONNECTIONS,
+        pool_maxsize=API_POOL_MAXSIZE,
+        max_retries=Retry(
+            total=2,
+            connect=2,
+            read=1,
+            backoff_factor=0.3,
+            status_forcelist=[502, 503, 504],
+            allowed_methods=["GET", "POST"]  # Search requests are safe to repeat
+        )
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    # Let the API (or a proxy in front of it) compress large result lists
+    session.headers.update({"Accept-Encoding": "gzip"})
+
+    # Open a keep-alive connection in the background while the first page renders
+    def prewarm():
+        try:
+            session.get(f"{API_BASE}/health", timeout=HEALTH_TIMEOUT)
+        except requests.exceptions.RequestException:
+            pass  # API not up yet; the first real call connects
+
+    threading.Thread(target=prewarm, daemon=True).start()
+    return session
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _read_video_count(mtime):
+    """Count the videos in the embeddings file; mtime is part of the cache key so edits invalidate it"""
+    # Parse straight from a read-only mapping of the file, no intermediate copy
+    with open(EMBEDDINGS_FILE, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        data = orjson.loads(memoryview(mm))
+    # Only the count is cached, so cache hits don't copy the whole manifest
+    return len(data.get("videos", []))
+
+
+def load_video_count():
+    """Number of videos with embeddings, or None if there is no embeddings file"""
     try:
-        with open(EMBEDDINGS_FILE, 'r') as f:
-            return json.load(f)
+        mtime = os.path.getmtime(EMBEDDINGS_FILE)
     except FileNotFoundError:
         return None
+    return _read_video_count(mtime)
+
+
+class SearchBatcher:
+    """Coalesce concurrent text searches into /batch-search requests"""
+
+    def __init__(self, session, max_size=BATCH_MAX_SIZE):
+        # The session is created in the script thread; the worker thread has no
+        # ScriptRunContext, so it must not call st.cache_resource functions itself
+        self.session = session
+        self.max_size = max_size
+        self._queue = queue.Queue()
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def submit(self, query, max_results, search_options):
+        """Queue a search; the returned future resolves to its /search-shaped response"""
+        future = Future()
+        self._queue.put((query, max_results, search_options, future))
+        return future
+
+    def _collect(self):
+        """Block for one search, then take whatever else is already queued; never waits for more"""
+        batch = [self._queue.get()]
+        while len(batch) < self.max_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            # A batch request carries one set of search options
+            groups = {}
+            for item in batch:
+                groups.setdefault(item[2], []).append(item)
+            for search_options, items in groups.items():
+                self._send(search_options, items)
+
+    def _send(self, search_options, items):
+        if len(items) == 1:
+            self._send_one(search_options, *items[0])
+            return
+        try:
+            response = self.session.post(
+                f"{API_BASE}/batch-search",
+                json={
+                    "queries": [{"q": query, "top_k": max_results} for query, max_results, _, _ in items],
+                    "search_options": list(search_options)
+                },
+                timeout=SEARCH_TIMEOUT
+            )
+            response.raise_for_status()
+            responses = orjson.loads(response.content)["results"]
+        except Exception as e:
+            for *_, future in items:
+                future.set_exception(e)
+            return
 
+        for (*_, future), result in zip(items, responses):
+            if "error" in result:
+                future.set_exception(requests.exceptions.RequestException(result["error"]))
+            else:
+                future.set_result(result)
 
-def search_videos(query=None, image=None, max_results=5, search_options=None):
-    """Search videos via API using text or image"""
-    try:
-        if search_options is None:
-            search_options = ["visual", "audio"]
-            
-        if query:  # Text search
-            response = requests.post(
+    def _send_one(self, search_options, query, max_results, _, future):
+        """Send a single search to /search without the batch endpoint's overhead"""
+        try:
+            response = self.session.post(
                 f"{API_BASE}/search",
                 json={
-                    "query": query, 
+                    "query": query,
                     "max_results": max_results,
-                    "search_options": search_options
+                    "search_options": list(search_options)
                 },
-                timeout=30
+                timeout=SEARCH_TIMEOUT
             )
-        elif image:  # Image search
-            # Create multipart form data with the image file
-            files = {"image_file": (image.name, image.getvalue(), f"image/{image.type.split('/')[1]}")}
-            data = {
-                "max_results": str(max_results),
-                "search_options": ",".join(search_options)
-            }
+            future.set_result(read_search_response(response))
+        except Exception as e:
+            future.set_exception(e)
+
+
+@st.cache_resource
+def get_batcher():
+    """Search batcher shared by all sessions"""
+    return SearchBatcher(get_session())
+
+
+@st.cache_data(ttl=300, max_entries=256, show_spinner=False)
+def _search_cached(query_norm, max_results, search_options):
+    """Run a text search through the batcher; failures raise so they are never cached"""
+    return get_batcher().submit(query_norm, max_results, search_options).result()
+
+
+@st.cache_data(ttl=300, max_entries=64, show_spinner=False)
+def _search_image_cached(image_digest, file_name, mime_type, max_results, search_options, send_original, _image_bytes):
+    """POST an image search; keyed on the image content hash rather than its bytes"""
+    if not send_original:
+        compressed = compress_image(_image_bytes)
+        # Keep the original when it is already smaller (e.g. a small, well-compressed JPEG)
+        if len(compressed) < len(_image_bytes):
+            file_name, mime_type, _image_bytes = f"{Path(file_name).stem}.jpg", "image/jpeg", compressed
+    response = get_session().post(
+        f"{API_BASE}/search/image",
+        files={"image_file": (file_name, _image_bytes, mime_type)},
+        data={
+            "max_results": str(max_results),
+            "search_options": ",".join(search_options)
+        },
+        timeout=IMAGE_SEARCH_TIMEOUT
+    )
+    return read_search_response(response)
+
+
+def compress_image(image_bytes):
+    """Downscale an image to UPLOAD_MAX_EDGE and re-encode it as JPEG"""
+    with Image.open(BytesIO(image_bytes)) as img:
+        img.thumbnail((UPLOAD_MAX_EDGE, UPLOAD_MAX_EDGE))
+        buffer = BytesIO()
+        img.convert("RGB").save(buffer, "JPEG", quality=UPLOAD_JPEG_QUALITY, optimize=True)
+    return buffer.getvalue()
+
+
+def read_search_response(response):
+    """Check a search response and parse its JSON body"""
+    response.raise_for_status()
+    return orjson.loads(response.content)
+
+
+def _image_payload(image):
+    """(digest, name, MIME type, bytes) of an upload, computed once per uploaded file"""
+    cached = st.session_state.get("image_payload")
+    if cached is None or cached[0] != image.file_id:
+        image_bytes = image.getvalue()
+        cached = (
+            image.file_id,
+            hashlib.sha256(image_bytes).hexdigest(),
+            image.name,
+            f"image/{image.type.split('/')[1]}",
+            image_bytes
+        )
+        st.session_state.image_payload = cached
+    return cached[1:]
+
+
+def search_videos(query=None, image=None, max_results=5, search_options=None, send_original=False):
+    """Search videos via API using text or image"""
+    try:
+        if search_options is None:
+            search_options = ["visual", "audio"]
             
-            response = requests.post(
-                f"{API_BASE}/search/image",
-                files=files,
-                data=data,
-                timeout=60  # Longer timeout for image uploads
+        if query:  # Text search, served from cache for repeated queries
+            # Normalize so trivial variants of a query share one cache entry
+            query_norm = " ".join(query.lower().split())
+            return _search_cached(query_norm, max_results, tuple(search_options))
+        elif image:  # Image search, cached on the uploaded file's content
+            image_digest, file_name, mime_type, image_bytes = _image_payload(image)
+            return _search_image_cached(
+                image_digest,
+                file_name,
+                mime_type,
+                max_results,
+                tuple(search_options),
+                send_original,
+                image_bytes
             )
         else:
             st.error("No query or image provided for search")
             return None
-            
-        response.raise_for_status()
-        return response.json()
-    except requests.exceptions.RequestException as e:
+    except requests.exceptions.Timeout:
+        st.error("Search timed out: the API is not responding. Check system status in the sidebar.")
+        return None
+    except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
         st.error(f"Search failed: {str(e)}")
         return None
 
 
+@st.cache_resource
+def get_executor():
+    """Worker pool shared across reruns for per-result file probing"""
+    return ThreadPoolExecutor(max_workers=8)
+
+
+@functools.lru_cache(maxsize=256)
+def probe_duration(video_filepath):
+    """Video duration in seconds from ffprobe, or None if unavailable"""
+    if FFPROBE is None or video_filepath == 'unknown' or not os.path.isfile(video_filepath):
+        return None
+    try:
+        probe = subprocess.run(
+            [FFPROBE, "-v", "error", "-show_entries", "format=duration",
+             "-of", "default=noprint_wrappers=1:nokey=1", video_filepath],
+            capture_output=True, text=True, timeout=10
+        )
+        return float(probe.stdout.strip())
+    except (OSError, subprocess.SubprocessError, ValueError):
+        return None
+
+
+def search_videos_batch(queries, max_results=5, search_options=None, session=None):
+    """Search several text queries with a single /batch-search request"""
+    if search_options is None:
+        search_options = ["visual", "audio"]
+    if session is None:
+        session = get_session()
+    response = session.post(
+        f"{API_BASE}/batch-search",
+        json={
+            "queries": [{"q": q, "top_k": max_results} for q in queries],
+            "search_options": search_options
+        },
+        timeout=60
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+@st.cache_resource
+def prewarm_example_queries():
+    """Warm the API search cache with the example queries once per process, in the background"""
+    # Resolve the session here; the background thread has no ScriptRunContext
+    session = get_session()
+
+    def warm():
+        try:
+            search_videos_batch(EXAMPLE_QUERIES, session=session)
+        except requests.exceptions.RequestException:
+            pass  # Prewarming is best effort
+
+    thread = threading.Thread(target=warm, daemon=True)
+    thread.start()
+    return thread
+
+
+@st.cache_data(ttl=10, show_spinner=False)
 def get_health_status():
     """Check API health"""
     try:
-        response = requests.get(f"{API_BASE}/health", timeout=5)
+        response = get_session().get(f"{API_BASE}/health", timeout=HEALTH_TIMEOUT)
         return response.json()
-    except:
+    except (requests.exceptions.RequestException, ValueError):
         return {"status": "offline"}
 
 
+def _fetch_sidebar():
+    """Fetch API health and video metadata"""
+    # Both are st.cache_data functions, so call them in the script thread (worker
+    # threads have no ScriptRunContext); once cached each is a cheap lookup
+    return get_health_status(), load_video_count()
+
+
+def _trigger_search():
+    """Widget callback: run a search on the next script run"""
+    st.session_state.do_search = True
+
+
+def _has_clip(start, end):
+    """Whether a result covers a clip rather than the full video"""
+    return start > 0 or (end > 0 and end != start)
+
+
+def prepare_result(i, result, video_duration):
+    """Precompute everything a result card shows, so rendering only emits elements"""
+    # Read each result field once
+    video_id = result['video_id']
+    filename = result.get('filename', 'unknown')
+    start = result['start']
+    end = result['end']
+    confidence = result['confidence']
+    score = result.get('score', 0.0)
+    video_filepath = result.get('video_filepath', 'unknown')
+
+    # Clip bounds; with no usable end the preview covers 30 seconds
+    has_clip = _has_clip(start, end)
+    clip_end = end if end > start else start + 30
+
+    # Raw result for the details panel, with a shortened video path
+    display_result = result.copy()
+    if 'video_filepath' in display_result and len(video_filepath) > 30:
+        display_result['video_filepath'] = '...' + video_filepath[-30:]
+
+    confidence_display, confidence_class = confidence_badge(confidence)
+    return {
+        "video_id": video_id,
+        "filename": filename,
+        "start": start,
+        "thumbnail_url": result.get('thumbnail_url'),
+        # Resolve the video file once per result (a single stat)
+        "video_available": video_filepath != 'unknown' and os.path.isfile(video_filepath),
+        # Previews stream from the API with range requests instead of through Streamlit
+        "media_url": f"{API_PUBLIC_BASE}/media/{video_id}",
+        "clip_caption": f"Clip: {start:.2f}s - {clip_end:.2f}s",
+        "display_result": display_result,
+        # Static part of the card (header, transcript, confidence, timing)
+        "card_html": _CARD_HTML.format(
+            i=i,
+            filename=filename,
+            text_block=_text_html(result['clip_text']),
+            confidence_class=confidence_class,
+            confidence_display=confidence_display,
+            time_block=_time_html(has_clip, start, end, video_duration)
+        ),
+        "key_data": (
+            f"**Video ID:** `{video_id}`  \n"
+            f"**Confidence:** `{confidence}`  \n"
+            f"**Start:** `{start:.2f}s` · **End:** `{end:.2f}s`"
+        ),
+        "footer_html": _FOOTER_HTML.format(
+            video_id=video_id,
+            score=f"{score:.1f}" if isinstance(score, (int, float)) else score,
+            filename=filename
+        )
+    }
+
+
+@st.fragment
+def render_result(i, card, show_video):
+    """Render one prepared result card; as a fragment, interacting with a card reruns only that card"""
+    with st.container():
+        st.markdown(card["card_html"], unsafe_allow_html=True)
+
+        # Only show video if the checkbox is checked; past the first few results the
+        # preview is built on demand (the toggle reruns just this fragment)
+        if show_video and (
+            i <= OPEN_PREVIEWS or st.toggle("Show preview", key=f"preview_{i}_{card['video_id']}")
+        ):
+            # Create two columns for video and raw data
+            video_col, data_col = st.columns([1, 1])
+
+            # Left column for video (smaller size)
+            with video_col:
+                st.write("**Video Preview:**")
+
+                # Check if the video file exists
+                if card["video_available"]:
+                    # Create a video player with a start time if specified
+                    if card["start"] > 0:
+                        # Add a compact message showing the exact clip segment
+                        st.caption(card["clip_caption"])
+                        st.video(card["media_url"], start_time=int(card["start"]))
+                    else:
+                        st.video(card["media_url"])
+
+                    # Display simple video info
+                    if card["filename"]:
+                        st.caption(f"File: {card['filename']}")
+                else:
+                    # If video file not found, show a placeholder
+                    if card["thumbnail_url"]:
+                        st.image(card["thumbnail_url"], caption="Video thumbnail")
+                    else:
+                        st.error("Video file not found")
+
+            # Right column for raw API data
+            with data_col:
+                st.write("**Raw API Response:**")
+                with st.expander("View details", expanded=False):
+                    st.json(card["display_result"])
+
+                # Show key metadata in a more readable format
+                st.caption("**Key Data Points:**")
+                st.markdown(card["key_data"])
+
+        # Video file info with cleaner display, as a single element
+        st.markdown(card["footer_html"], unsafe_allow_html=True)
+
+        # Add download link if file exists; the API streams the file only when clicked
+        if card["video_available"]:
+            st.link_button(
+                "Download Video",
+                f"{API_PUBLIC_BASE}/videos/{card['video_id']}/download"
+            )
+
+
+@st.fragment
+def render_results(total_results, cards):
+    """Render the results panel; as a fragment, the "Show videos" toggle reruns only this panel"""
+    show_video = st.checkbox("Show videos", value=True,
+                             help="Display video players in results",
+                             key="show_video_checkbox")
+
+    # Minimalist results header
+    st.markdown(
+        f'<div style="background-color: #f1f3f2; color: #2c4c3b; padding: 8px 12px; border-left: 3px solid #2c4c3b; margin-bottom: 15px; font-weight: 500;">'
+        f'Found {total_results} results'
+        f'</div>',
+        unsafe_allow_html=True
+    )
+
+    # Display results
+    for i, card in enumerate(cards, 1):
+        render_result(i, card, show_video)
+
+
 def main():
     st.title("🎬 Semantic Video Search POC")
     st.write("Search through videos using natural language queries")
@@ -86,10 +667,15 @@ def main():
     # Sidebar - System Status
     with st.sidebar:
         st.header("System Status")
+        # Health is cached for a few seconds; drop it so this run checks the API again
+        st.button("🔄 Refresh status", key="refresh_status", on_click=get_health_status.clear)
+
+        # API health and video metadata, each cached between reruns
+        health, video_count = _fetch_sidebar()
 
         # API Status
-        health = get_health_status()
         if health["status"] == "healthy":
+            prewarm_example_queries()
             st.success("✅ API Online")
             st.write(f"Index ID: `{health.get('index_id', 'N/A')[:8]}...`")
         elif health["status"] == "no_index":
@@ -100,10 +686,9 @@ def main():
             st.write("Start the API server first")
 
         # Video Data Status
-        video_data = load_video_data()
-        if video_data:
+        if video_count is not None:
             st.success("✅ Embeddings loaded")
-            st.write(f"Videos: {len(video_data.get('videos', []))}")
+            st.write(f"Videos: {video_count}")
         else:
             st.error("❌ No embeddings found")
 
@@ -135,7 +720,8 @@ def main():
             query = st.text_input(
                 "Enter your search query:",
                 placeholder="e.g., person talking, outdoor scene, laughter, office meeting",
-                key="search_query_input"
+                key="search_query_input",
+                on_change=_trigger_search  # Enter on a changed query searches right away
             )
             uploaded_image = None
     else:  # Image search
@@ -150,13 +736,22 @@ def main():
             if uploaded_image:
                 # Preview the uploaded image
                 st.image(uploaded_image, width=250, caption="Search image preview")
+            send_original = st.checkbox(
+                "Send original image",
+                value=False,
+                key="send_original",
+                help="By default the image is downscaled and recompressed as JPEG before upload"
+            )
             query = None
 
     with col2:
         max_results = st.selectbox("Max results:", [3, 5, 10], index=1, key="max_results_select")
+        if st.button("Clear cache", key="clear_search_cache"):
+            _search_cached.clear()
+            _search_image_cached.clear()
 
     # Search options
-    col_options1, col_options2 = st.columns([1, 1])
+    col_options1, _ = st.columns([1, 1])
     with col_options1:
         search_options = st.multiselect(
             "Search options:", 
@@ -164,15 +759,14 @@ def main():
             default=["visual", "audio"],
             key="search_options_select"
         )
-    with col_options2:
-        show_video = st.checkbox("Show videos", value=True, 
-                                help="Display video players in results",
-                                key="show_video_checkbox")
     
     # Search button - enabled for text search with query or image search with uploaded image
     search_enabled = (search_type == "Text" and query and query.strip()) or (search_type == "Image" and uploaded_image is not None)
     
-    if st.button("🔍 Search", type="primary", disabled=not search_enabled) or (search_type == "Text" and query):
+    # Search only when requested (button press or a newly entered query); the flag is
+    # consumed here so unrelated reruns (toggles, option changes) don't search again
+    st.button("🔍 Search", type="primary", disabled=not search_enabled, on_click=_trigger_search)
+    if st.session_state.pop("do_search", False):
         # Different validations based on search type
         if search_type == "Text" and (not query or not query.strip()):
             st.warning("Please enter a search query")
@@ -185,255 +779,44 @@ def main():
             st.error("API not ready. Check system status in sidebar.")
             return
 
-        with st.spinner("Searching videos..."):
-            # Use the appropriate search method based on selected type
-            if search_type == "Text":
-                results = search_videos(query=query, max_results=max_results, search_options=search_options)
-            else:  # Image search
-                results = search_videos(image=uploaded_image, max_results=max_results, search_options=search_options)
-
-        if results:
-            # Minimalist results header
-            st.markdown(
-                f'<div style="background-color: #f1f3f2; color: #2c4c3b; padding: 8px 12px; border-left: 3px solid #2c4c3b; margin-bottom: 15px; font-weight: 500;">'
-                f'Found {results["total_results"]} results'
-                f'</div>',
-                unsafe_allow_html=True
+        # Card styling, emitted once for the placeholders and all results (matches Twelve Labs style)
+        st.markdown(_RESULT_CSS, unsafe_allow_html=True)
+
+        # Placeholder cards are sent to the browser before the request blocks,
+        # so the page lays out while the search is in flight
+        skeleton = st.empty()
+        with skeleton.container():
+            st.caption("Searching videos...")
+            st.markdown(_SKELETON_CARD * max_results, unsafe_allow_html=True)
+
+        # Use the appropriate search method based on selected type
+        if search_type == "Text":
+            results = search_videos(query=query, max_results=max_results, search_options=search_options)
+        else:  # Image search
+            results = search_videos(
+                image=uploaded_image,
+                max_results=max_results,
+                search_options=search_options,
+                send_original=send_original
             )
+        skeleton.empty()
 
-            # Display results
-            for i, result in enumerate(results["results"], 1):
-                with st.container():
-                    # Create a card-like container with border and padding that matches Twelve Labs style
-                    st.markdown("""
-                    <style>
-                    .result-card {
-                        border: 1px solid #eaeaea;
-                        border-radius: 6px;
-                        padding: 0;
-                        margin-bottom: 20px;
-                        background-color: white;
-                        box-shadow: 0 1px 3px rgba(0,0,0,0.05);
-                    }
-                    .result-header {
-                        background-color: #f5f5f5;
-                        color: #333;
-                        padding: 8px 12px;
-                        margin: 0;
-                        border-top-left-radius: 6px;
-                        border-top-right-radius: 6px;
-                        border-bottom: 1px solid #eaeaea;
-                        font-weight: 500;
-                    }
-                    .result-content {
-                        padding: 12px;
-                    }
-                    .text-block {
-                        background-color: #fafafa;
-                        border-radius: 4px;
-                        padding: 8px 10px;
-                        margin-bottom: 10px;
-                        border-left: 2px solid #ccc;
-                        font-size: 14px;
-                    }
-                    .confidence-indicator {
-                        font-weight: 500;
-                        display: inline-block;
-                        padding: 3px 8px;
-                        border-radius: 4px;
-                        color: white;
-                        font-size: 12px;
-                        letter-spacing: 0.3px;
-                    }
-                    .high-confidence {
-                        background-color: #27ae60;
-                    }
-                    .medium-confidence {
-                        background-color: #f39c12;
-                    }
-                    .low-confidence {
-                        background-color: #e74c3c;
-                    }
-                    </style>
-                    """, unsafe_allow_html=True)
-                    
-                    # Create the card header and content separately
-                    st.markdown(f'<div class="result-card">', unsafe_allow_html=True)
-                    st.markdown(f'<div class="result-header"><h3>Result {i}: {result["filename"]}</h3></div>', unsafe_allow_html=True)
-                    st.markdown(f'<div class="result-content">', unsafe_allow_html=True)
-                    
-                    # Use a more balanced column layout
-                    col1, col2, col3 = st.columns([2, 1, 1])
-
-                    with col1:
-                        if result["clip_text"]:
-                            # Use custom styling for text display
-                            st.markdown(
-                                f'<div class="text-block">'
-                                f'<strong>Text:</strong> {result["clip_text"]}'
-                                f'</div>',
-                                unsafe_allow_html=True
-                            )
-                        else:
-                            st.markdown(
-                                '<div class="text-block" style="color: #666;">'
-                                '<em>No text transcript available</em>'
-                                '</div>',
-                                unsafe_allow_html=True
-                            )
-
-                    with col2:
-                        # Handle confidence as string or float
-                        confidence_value = result['confidence']
-                        
-                        # Determine confidence class and display
-                        confidence_class = ""
-                        
-                        if isinstance(confidence_value, str):
-                            confidence_display = confidence_value
-                            if confidence_value.lower() == "high":
-                                confidence_class = "high-confidence"
-                            elif confidence_value.lower() == "medium":
-                                confidence_class = "medium-confidence"
-                            elif confidence_value.lower() == "low":
-                                confidence_class = "low-confidence"
-                        else:
-                            # For numeric values
-                            if confidence_value > 0.7:
-                                confidence_display = "high"
-                                confidence_class = "high-confidence"
-                            elif confidence_value > 0.4:
-                                confidence_display = "medium"
-                                confidence_class = "medium-confidence"
-                            else:
-                                confidence_display = "low"
-                                confidence_class = "low-confidence"
-                            
-                        # Display confidence with badge styling like in Twelve Labs UI
-                        st.markdown(
-                            f'<div style="text-align: center;">'
-                            f'<p><strong>Confidence</strong></p>'
-                            f'<div class="confidence-indicator {confidence_class}">'
-                            f'{confidence_display}'
-                            f'</div>'
-                            f'</div>',
-                            unsafe_allow_html=True
-                        )
-
-                    with col3:
-                        if result["start"] > 0 or (result["end"] > 0 and result["end"] != result["start"]):
-                            start_time = result['start']
-                            end_time = result['end']
-                            duration = end_time - start_time
-                            
-                            # Format as minutes:seconds if duration is long enough
-                            if end_time >= 60:
-                                start_formatted = f"{int(start_time//60)}:{int(start_time%60):02d}"
-                                end_formatted = f"{int(end_time//60)}:{int(end_time%60):02d}"
-                                st.write(f"**Time:** {start_formatted} - {end_formatted}")
-                            else:
-                                st.write(f"**Time:** {start_time:.1f}s - {end_time:.1f}s")
-                                
-                            # Display duration
-                            st.caption(f"Duration: {duration:.1f}s")
-                        else:
-                            st.write("**Full video**")
-                            # If we have the video filepath, we can try to get the duration
-                            video_filepath = result.get('video_filepath', 'unknown')
-                            if video_filepath != 'unknown' and Path(video_filepath).exists():
-                                try:
-                                    # This is a placeholder - in a real app you'd use a video 
-                                    # processing library like moviepy or ffmpeg to get the duration
-                                    st.caption("Full video duration available")
-                                except:
-                                    pass
-
-                    # Only show video if the checkbox is checked
-                    if show_video:
-                        # Create two columns for video and raw data
-                        video_col, data_col = st.columns([1, 1])
-                        
-                        # Left column for video (smaller size)
-                        with video_col:
-                            st.write("**Video Preview:**")
-                            
-                            # Get video filepath
-                            video_filepath = result.get('video_filepath', 'unknown')
-                            
-                            # Check if the video file exists
-                            if video_filepath != 'unknown' and Path(video_filepath).exists():
-                                # Create a video player with a start time if specified
-                                if result["start"] > 0:
-                                    # Store exact start and end times for UI display
-                                    exact_start = result["start"]
-                                    exact_end = result["end"] if result["end"] > result["start"] else exact_start + 30
-                                    
-                                    # Add a compact message showing the exact clip segment
-                                    st.caption(f"Clip: {exact_start:.2f}s - {exact_end:.2f}s")
-                                    st.video(video_filepath, start_time=int(exact_start))
-                                else:
-                                    st.video(video_filepath)
-                                
-                                # Display simple video info
-                                if result.get('filename'):
-                                    st.caption(f"File: {result.get('filename')}")
-                            else:
-                                # If video file not found, show a placeholder
-                                if result.get('thumbnail_url'):
-                                    st.image(result['thumbnail_url'], caption="Video thumbnail")
-                                else:
-                                    st.error("Video file not found")
-                        
-                        # Right column for raw API data
-                        with data_col:
-                            st.write("**Raw API Response:**")
-                            # Create a clean display of the raw result data
-                            with st.expander("View details", expanded=False):
-                                # Create a copy of the result without the video path for cleaner display
-                                display_result = result.copy()
-                                if 'video_filepath' in display_result:
-                                    display_result['video_filepath'] = '...' + display_result['video_filepath'][-30:] if len(display_result['video_filepath']) > 30 else display_result['video_filepath']
-                                
-                                st.json(display_result)
-                            
-                            # Show key metadata in a more readable format
-                            st.caption("**Key Data Points:**")
-                            metadata_cols = st.columns(2)
-                            with metadata_cols[0]:
-                                st.markdown(f"**Video ID:** `{result.get('video_id', 'N/A')}`")
-                                st.markdown(f"**Confidence:** `{result.get('confidence', 'N/A')}`")
-                            with metadata_cols[1]:
-                                st.markdown(f"**Start:** `{result.get('start', 0):.2f}s`")  
-                                st.markdown(f"**End:** `{result.get('end', 0):.2f}s`")
-                            
-                    # Video file info with cleaner display
-                    col_info1, col_info2, col_info3 = st.columns([1, 1, 1])
-                    with col_info1:
-                        st.caption(f"Video ID: `{result['video_id']}`")
-                    with col_info2:
-                        score = result.get('score', 0.0)
-                        if isinstance(score, (int, float)):
-                            st.caption(f"Match Score: {score:.1f}")
-                        else:
-                            st.caption(f"Match Score: {score}")
-                    with col_info3:
-                        st.caption(f"File: {result.get('filename', 'unknown')}")
-
-                    # Add download button if file exists
-                    if video_filepath != 'unknown' and Path(video_filepath).exists():
-                        with open(video_filepath, "rb") as file:
-                            video_bytes = file.read()
-                            st.download_button(
-                                label="Download Video",
-                                data=video_bytes,
-                                file_name=result.get('filename', 'video.mp4'),
-                                mime="video/mp4",
-                                key=f"download_btn_{i}_{result.get('video_id', i)}"  # Add unique key for each download button
-                            )
-
-                    # Close the container divs
-                    st.markdown('</div></div>', unsafe_allow_html=True)
-
+        if results:
+            # Only full-video cards show a duration; probe those in parallel before rendering
+            executor = get_executor()
+            futures = [
+                None if _has_clip(result['start'], result['end'])
+                else executor.submit(probe_duration, result.get('video_filepath', 'unknown'))
+                for result in results["results"]
+            ]
+            durations = [future.result() if future else None for future in futures]
+
+            # Format every card in one pass, so panel and card reruns only emit elements
+            cards = [
+                prepare_result(i, result, video_duration)
+                for i, (result, video_duration) in enumerate(zip(results["results"], durations), 1)
+            ]
+            render_results(results["total_results"], cards)
         else:
             st.error("Search failed or no results found")
 
@@ -6,15 +6,22 @@ Test script for the Semantic Video Search API
 import requests
 import json
 import argparse
+import statistics
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
 
-def test_search_api(query="person walking", max_results=3, api_url="http://localhost:8000"):
+def test_search_api(query="person walking", max_results=3, api_url="http://localhost:8000", session=None):
     """Test the search API endpoint"""
+    # One keep-alive session serves the health check and the search
+    if session is None:
+        with requests.Session() as session:
+            return test_search_api(query, max_results, api_url, session)
     
     # First check if the API is running
     try:
-        health_response = requests.get(f"{api_url}/health", timeout=5)
+        health_response = session.get(f"{api_url}/health", timeout=5)
         if health_response.status_code != 200:
             print(f"API health check failed with status code {health_response.status_code}")
             print(health_response.text)
@@ -34,7 +41,7 @@ def test_search_api(query="person walking", max_results=3, api_url="http://local
     print(f"Payload: {json.dumps(payload, indent=2)}")
     
     try:
-        search_response = requests.post(
+        search_response = session.post(
             search_url, 
             json=payload,
             timeout=10  # Increased timeout for search operation
@@ -71,12 +78,53 @@ def test_search_api(query="person walking", max_results=3, api_url="http://local
         print(f"Error making search request: {str(e)}")
         return False
 
+def _timed_search(session, query, max_results, api_url):
+    """Send one search request; return (latency in seconds, status code or None)"""
+    started = time.perf_counter()
+    try:
+        response = session.post(
+            f"{api_url}/search",
+            json={"query": query, "max_results": max_results},
+            timeout=10
+        )
+        status = response.status_code
+    except requests.exceptions.RequestException:
+        status = None
+    return time.perf_counter() - started, status
+
+def test_search_concurrency(query="person walking", max_results=3, api_url="http://localhost:8000", concurrency=4):
+    """Fire concurrent search requests and report latency and throughput"""
+    print(f"\nSending {concurrency} concurrent search requests to {api_url}/search")
+    with requests.Session() as session:
+        # Size the connection pool so every worker keeps its own connection
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=concurrency)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            futures = [
+                executor.submit(_timed_search, session, query, max_results, api_url)
+                for _ in range(concurrency)
+            ]
+            outcomes = [future.result() for future in futures]
+        elapsed = time.perf_counter() - started
+
+    latencies = sorted(latency for latency, _ in outcomes)
+    failures = sum(1 for _, status in outcomes if status != 200)
+    p95 = latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))]
+    print(f"Completed: {len(outcomes) - failures} ok, {failures} failed in {elapsed:.2f}s "
+          f"({len(outcomes) / elapsed:.1f} req/s)")
+    print(f"Latency: min {latencies[0]:.3f}s, median {statistics.median(latencies):.3f}s, p95 {p95:.3f}s")
+    return failures == 0
+
 def main():
     """Main entry point"""
     parser = argparse.ArgumentParser(description='Test the Semantic Video Search API')
     parser.add_argument('--query', type=str, default="person walking", help='Search query text')
     parser.add_argument('--max', type=int, default=3, help='Maximum number of results')
     parser.add_argument('--url', type=str, default="http://localhost:8000", help='API base URL')
+    parser.add_argument('--concurrency', type=int, default=1, help='Number of search requests to send in parallel (1 runs the detailed single-request test)')
     parser.add_argument('--wait', type=int, default=0, help='Wait time in seconds before testing (useful if starting server separately)')
     
     args = parser.parse_args()
@@ -89,7 +137,10 @@ def main():
     print("Semantic Video Search API Test")
     print("=" * 50)
     
-    success = test_search_api(args.query, args.max, args.url)
+    if args.concurrency > 1:
+        success = test_search_concurrency(args.query, args.max, args.url, args.concurrency)
+    else:
+        success = test_search_api(args.query, args.max, args.url)
     sys.exit(0 if success else 1)
 
 if __name__ == "__main__":
@@ -3,175 +3,302 @@
 Test script for Twelve Labs API search functionality
 """
 
+import asyncio
 import os
 import sys
-import json
+import functools
+import ijson
+import orjson
 import logging
 import argparse
-from pathlib import Path
+import operator
 
-sys.path.append(str(Path(__file__).parent))
+from src.api.search_cache import SearchCache
+from src.embeddings.twelve_labs_client import SearchOpts, TwelveLabsClient
+from config.settings import CLI_SEARCH_CACHE_FILE, EMBEDDINGS_FILE
 
-from src.embeddings.twelve_labs_client import TwelveLabsClient
-from config.settings import EMBEDDINGS_FILE
+logger = logging.getLogger("test_search")
 
-# Configure logging
-logging.basicConfig(
-    level=logging.DEBUG,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler()
-    ]
+# Index searched by the tests
+TEST_INDEX_ID = "68c84ff6707c44d8e8db8c16"
+
+# Upper bound on searches running at once when several queries are given
+MAX_CONCURRENT_SEARCHES = 8
+
+# Search options used when test_search is not given any; immutable, so built once
+DEFAULT_SEARCH_OPTS = SearchOpts(
+    search_options=("visual", "audio"),
+    threshold="medium",
+    operator="or",
+    page_limit=2,
+    adjust_confidence_level=0.5,
+    group_by="video"
 )
-logger = logging.getLogger("test_search")
+
+# Result fields read for the report. The client's result dicts carry every one of
+# them, so a single itemgetter call reads them all; .get() defaults are only the
+# fallback for dicts that miss a key
+_RESULT_FIELDS = ("video_id", "confidence", "score", "start", "end", "metadata", "clip_text")
+_RESULT_DEFAULTS = ("N/A", 0.0, 0.0, 0.0, 0.0, {}, "")
+_RESULT_GET = operator.itemgetter(*_RESULT_FIELDS)
+
+# Per-result report formatters, built once
+_RESULT_TEMPLATE = (
+    "\nResult #{number}:\n"
+    "  Video ID: {video_id}\n"
+    "  Filename: {filename}\n"
+    "  Confidence: {confidence}\n"
+    "  Score: {score}\n"
+    "  Time Range: {time_range}"
+).format
+_NUMERIC_RANGE = "{:.2f}s - {:.2f}s".format
+_RAW_RANGE = "{}s - {}s".format
+_NUMERIC_SCORE = "{:.4f}".format
+_SEPARATOR = "-" * 40
+
+
+@functools.lru_cache(maxsize=1)
+def _get_client():
+    """Twelve Labs client shared by the test helpers in this process"""
+    return TwelveLabsClient()
+
+
+@functools.lru_cache(maxsize=1)
+def _get_search_cache():
+    """Persistent search cache, loaded from disk once per process"""
+    cache = SearchCache(path=CLI_SEARCH_CACHE_FILE)
+    cache.load()
+    return cache
+
+
+@functools.lru_cache(maxsize=4)
+def _read_index_id(mtime_ns):
+    """Stream the embeddings file up to its index ID; memoized per file modification time"""
+    with open(EMBEDDINGS_FILE, 'rb') as f:
+        # Stops at the top-level key instead of materializing every embedding
+        return next(ijson.items(f, "index_id"), None)
+
+
+def _dump_json(data):
+    """Write data to stdout as indented JSON"""
+    # Flush pending text output first so it stays ahead of the raw bytes
+    sys.stdout.flush()
+    sys.stdout.buffer.write(orjson.dumps(data, option=orjson.OPT_INDENT_2, default=str) + b"\n")
+    sys.stdout.buffer.flush()
+
+
+def _result_values(item):
+    """Fetch all report fields with one itemgetter call, or per-field .get() when a key is missing"""
+    try:
+        return _RESULT_GET(item)
+    except KeyError:
+        return tuple(item.get(field, default) for field, default in zip(_RESULT_FIELDS, _RESULT_DEFAULTS))
+
+
+def _format_score(score):
+    """Format a score to four decimals, or as-is when it is not numeric"""
+    return _NUMERIC_SCORE(score) if isinstance(score, (int, float)) else str(score)
+
+
+def _format_range(start, end):
+    """Format a clip's time range, falling back to raw values when either bound is not numeric"""
+    if isinstance(start, (int, float)) and isinstance(end, (int, float)):
+        return _NUMERIC_RANGE(start, end)
+    return _RAW_RANGE(start, end)
 
 
 def load_index_id():
     """Load the index ID from embeddings file"""
     try:
-        with open(EMBEDDINGS_FILE, 'r') as f:
-            data = json.load(f)
-            index_id = data.get("index_id")
-            if not index_id:
-                logger.error(f"No index_id found in {EMBEDDINGS_FILE}")
-                return None
-            logger.info(f"Loaded index_id: {index_id}")
-            return index_id
+        index_id = _read_index_id(os.stat(EMBEDDINGS_FILE).st_mtime_ns)
     except FileNotFoundError:
-        logger.error(f"Embeddings file not found: {EMBEDDINGS_FILE}")
+        logger.error("Embeddings file not found: %s", EMBEDDINGS_FILE)
         return None
-    except json.JSONDecodeError:
-        logger.error(f"Invalid JSON in embeddings file: {EMBEDDINGS_FILE}")
+    except ijson.JSONError:
+        logger.error("Invalid JSON in embeddings file: %s", EMBEDDINGS_FILE)
+        return None
+    if not index_id:
+        logger.error("No index_id found in %s", EMBEDDINGS_FILE)
         return None
+    logger.info("Loaded index_id: %s", index_id)
+    return index_id
 
 
-def test_search(query="pepsi can", options=None):
-    """Test search functionality"""
-    logger.info(f"Testing search with query: '{query}'")
-    
-    # Load the index ID
-    # index_id = load_index_id()
-    index_id = "68c84ff6707c44d8e8db8c16"
-    if not index_id:
-        logger.error("Cannot proceed without an index ID")
-        return False
-    
-    # Create a client
-    logger.info("Creating Twelve Labs client")
-    client = TwelveLabsClient()
-    
-    # Default search options
-    if options is None:
-        options = {
-            "search_options": ["visual", "audio"],
-            "threshold": "medium",
-            "operator": "or",
-            "page_limit": 2,
-            "adjust_confidence_level": 0.5,
-            "group_by": "video"
-        }
-    
-    logger.info(f"Search options: {options}")
-    
+def fetch_search(client, index_id, query, options, cache=None):
+    """Run one search, answering from the cache when possible; the caller saves the cache"""
+    cache_key = SearchCache.make_key(index_id, query, options.to_params())
+    if cache is not None:
+        result = cache.get(cache_key)
+        if result is not None:
+            logger.info("Search cache hit (%s)", CLI_SEARCH_CACHE_FILE)
+            return result
+
     # Execute the search
-    logger.info(f"Executing search on index {index_id}")
+    logger.info("Executing search on index %s", index_id)
     result = client.search_text(
         index_id=index_id,
         query=query,
         options=options
     )
-    
+    if cache is not None and result["success"]:
+        cache.set(cache_key, result)
+    return result
+
+
+def print_search_report(query, result, verbose=False):
+    """Print the results of one search; returns whether the search succeeded"""
     # Check if the search was successful
     if not result["success"]:
-        logger.error(f"Search failed: {result['error']}")
+        logger.error("Search failed: %s", result['error'])
         return False
     
     # Log the search results
     search_data = result["data"]
-    logger.info(f"Search result data structure: {list(search_data.keys()) if isinstance(search_data, dict) else type(search_data)}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Search result data structure: %s", list(search_data.keys()) if isinstance(search_data, dict) else type(search_data))
     
     # Process search results
     results = search_data.get("data", [])
-    logger.info(f"Number of search results: {len(results)}")
+    logger.info("Number of search results: %d", len(results))
     
-    # Print the search results
-    print("\n=== SEARCH RESULTS ===")
-    print(f"Query: '{query}'")
-    print(f"Total results: {len(results)}")
-    print("=" * 50)
+    # Build the search results report and write it in one call
+    lines = [
+        "\n=== SEARCH RESULTS ===",
+        f"Query: '{query}'",
+        f"Total results: {len(results)}",
+        "=" * 50
+    ]
     
-    for i, item in enumerate(results):
-        print(f"\nResult #{i+1}:")
-        video_id = item.get("video_id", "N/A")
-        confidence = item.get("confidence", 0.0)
-        score = item.get("score", 0.0)
-        start = item.get("start", 0.0)
-        end = item.get("end", 0.0)
-        metadata = item.get("metadata", {})
-        filename = metadata.get("filename", "unknown") if isinstance(metadata, dict) else "unknown"
-        clip_text = item.get("clip_text", "")
-        
-        print(f"  Video ID: {video_id}")
-        print(f"  Filename: {filename}")
-        print(f"  Confidence: {confidence}")
-        # Check if score is a number or a string
-        if isinstance(score, (int, float)):
-            print(f"  Score: {score:.4f}")
-        else:
-            print(f"  Score: {score}")
-        # Check if start and end are numbers or strings
-        if isinstance(start, (int, float)) and isinstance(end, (int, float)):
-            print(f"  Time Range: {start:.2f}s - {end:.2f}s")
-        else:
-            print(f"  Time Range: {start}s - {end}s")
+    for i, item in enumerate(results, 1):
+        video_id, confidence, score, start, end, metadata, clip_text = _result_values(item)
+        lines.append(_RESULT_TEMPLATE(
+            number=i,
+            video_id=video_id,
+            # Metadata can be None or a non-dict on any item, so it is checked per item
+            filename=metadata.get("filename", "unknown") if isinstance(metadata, dict) else "unknown",
+            confidence=confidence,
+            score=_format_score(score),
+            time_range=_format_range(start, end)
+        ))
         if clip_text:
-            print(f"  Text: {clip_text}")
-        print("-" * 40)
+            lines.append(f"  Text: {clip_text}")
+        lines.append(_SEPARATOR)
+    
+    sys.stdout.write("\n".join(lines) + "\n")
     
     # Print the raw JSON output for debugging
-    print("\n=== RAW JSON OUTPUT ===")
-    print(json.dumps(result, indent=2, default=str))
+    if verbose:
+        print("\n=== RAW JSON OUTPUT ===")
+        _dump_json(result)
     
     return True
 
 
-def test_clip_access(video_id, start_time, end_time):
-    """Test accessing a specific clip"""
-    logger.info(f"Testing clip access for video_id: {video_id}, time range: {start_time}-{end_time}")
+def test_search(query="pepsi can", options=None, use_cache=True, verbose=False):
+    """Test search functionality"""
+    logger.info("Testing search with query: '%s'", query)
     
-    # Create a client
-    client = TwelveLabsClient()
+    # Load the index ID
+    # index_id = load_index_id()
+    index_id = TEST_INDEX_ID
+    if not index_id:
+        logger.error("Cannot proceed without an index ID")
+        return False
     
-    # Get video info
-    video_info = client.get_video_info(video_id)
+    # Default search options; dicts are validated into a SearchOpts
+    options = SearchOpts.coerce(options) if options is not None else DEFAULT_SEARCH_OPTS
+    
+    logger.info("Search options: %s", options)
+    
+    # Repeated runs of the same search are answered from a persistent cache
+    cache = _get_search_cache() if use_cache else None
+    result = fetch_search(_get_client(), index_id, query, options, cache)
+    if cache is not None:
+        cache.save()
+    
+    return print_search_report(query, result, verbose)
+
+
+def print_video_info(video_info):
+    """Print the result of a video info lookup; returns whether it succeeded"""
     if not video_info["success"]:
-        logger.error(f"Failed to get video info: {video_info['error']}")
+        logger.error("Failed to get video info: %s", video_info['error'])
         return False
     
-    logger.info(f"Video info: {video_info['data']}")
+    logger.debug("Video info: %s", video_info['data'])
     print("\n=== VIDEO INFO ===")
-    print(json.dumps(video_info["data"], indent=2, default=str))
+    _dump_json(video_info["data"])
     
     return True
 
 
+def test_clip_access(video_id, start_time, end_time):
+    """Test accessing a specific clip"""
+    logger.info("Testing clip access for video_id: %s, time range: %s-%s", video_id, start_time, end_time)
+    
+    # Get video info
+    return print_video_info(_get_client().get_video_info(video_id))
+
+
+async def run_tests(args):
+    """Run every query (and the clip access test, if requested) concurrently"""
+    # Build the shared client and cache here, before any worker thread can race to create them
+    client = _get_client()
+    cache = None if args.no_cache else _get_search_cache()
+    logger.info("Search options: %s", DEFAULT_SEARCH_OPTS)
+
+    # Bound the number of searches in flight to stay within the API rate limit
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_SEARCHES)
+
+    async def run_search(query):
+        async with semaphore:
+            return await asyncio.to_thread(fetch_search, client, TEST_INDEX_ID, query, DEFAULT_SEARCH_OPTS, cache)
+
+    tasks = [run_search(query) for query in args.query]
+    if args.video_id:
+        logger.info("Testing clip access for video_id: %s, time range: %s-%s", args.video_id, args.start, args.end)
+        tasks.append(asyncio.to_thread(client.get_video_info, args.video_id))
+    outcomes = await asyncio.gather(*tasks)
+
+    # Workers only fetch; the cache is saved once and reports print in order from this thread
+    if cache is not None:
+        cache.save()
+    succeeded = [
+        print_search_report(query, result, args.verbose)
+        for query, result in zip(args.query, outcomes)
+    ]
+    if args.video_id:
+        succeeded.append(print_video_info(outcomes[-1]))
+    return all(succeeded)
+
+
 def main():
     """Main entry point"""
     parser = argparse.ArgumentParser(description='Test Twelve Labs API search functionality')
-    parser.add_argument('query', type=str, help='Search query text')
+    parser.add_argument('query', type=str, nargs='+', help='Search query text; several queries run concurrently')
     parser.add_argument('--video-id', type=str, help='Video ID for clip access test')
     parser.add_argument('--start', type=float, default=0.0, help='Clip start time in seconds')
     parser.add_argument('--end', type=float, default=10.0, help='Clip end time in seconds')
+    parser.add_argument('--no-cache', action='store_true', help='Always query the API instead of the local search cache')
+    parser.add_argument('--verbose', action='store_true', help='Enable debug logging and print the raw JSON search response')
     
     args = parser.parse_args()
+    if args.start < 0 or args.start >= args.end:
+        parser.error("--start must be non-negative and less than --end")
+    
+    # Configure logging
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.StreamHandler()
+        ]
+    )
     
     print("Twelve Labs API Search Test")
     print("=" * 50)
     
-    if args.video_id:
-        test_clip_access(args.video_id, args.start, args.end)
-    else:
-        test_search(args.query)
+    asyncio.run(run_tests(args))
 
 
 if __name__ == "__main__":